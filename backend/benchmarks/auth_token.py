@@ -0,0 +1,87 @@
+"""
+Measures what the signed-token check costs a request, next to the checks it
+replaces (a bcrypt verify; a users lookup would add a Mongo round trip on top).
+
+Prints the per-call cost of issuing and verifying a token, of a bcrypt verify,
+and the per-request overhead of the current_user dependency on a minimal app.
+
+Run from the repo root:
+    python -m backend.benchmarks.auth_token [--iterations 20000] [--requests 2000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+import timeit
+
+
+def per_call_us(fn, iterations: int) -> float:
+    return round(min(timeit.repeat(fn, number=iterations, repeat=5)) / iterations * 1e6, 2)
+
+
+async def request_us(client, path: str, headers: dict, requests: int) -> float:
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        r = await client.get(path, headers=headers)
+        timings.append(time.perf_counter() - started)
+        r.raise_for_status()
+    return round(statistics.median(timings) * 1e6, 1)
+
+
+async def dependency_overhead(requests: int) -> dict:
+    import httpx
+    from fastapi import Depends, FastAPI
+
+    from backend.routes.dependencies import current_user
+    from backend.services.token_service import issue_token
+
+    app = FastAPI()
+
+    @app.get("/open")
+    async def open_route():
+        return {"ok": True}
+
+    @app.get("/signed-in")
+    async def signed_in_route(user: dict = Depends(current_user)):
+        return {"ok": True}
+
+    headers = {"Authorization": f"Bearer {issue_token('bench@example.com', 'bench')}"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Warm up both routes before timing.
+        await request_us(client, "/open", headers, 50)
+        await request_us(client, "/signed-in", headers, 50)
+        without = await request_us(client, "/open", headers, requests)
+        with_auth = await request_us(client, "/signed-in", headers, requests)
+    return {
+        "request_median_us": without,
+        "request_with_auth_median_us": with_auth,
+        "auth_overhead_us": round(with_auth - without, 1),
+    }
+
+
+def main(args) -> None:
+    os.environ.setdefault("AUTH_TOKEN_SECRET", "benchmark")
+
+    from backend.services.auth_service import hash_password, verify_password
+    from backend.services.token_service import issue_token, verify_token
+
+    token = issue_token("bench@example.com", "bench")
+    hashed = hash_password("benchmark-password")
+    results = {
+        "issue_token_us": per_call_us(lambda: issue_token("bench@example.com", "bench"), args.iterations),
+        "verify_token_us": per_call_us(lambda: verify_token(token), args.iterations),
+        "bcrypt_verify_us": per_call_us(lambda: verify_password("benchmark-password", hashed), 3),
+        **asyncio.run(dependency_overhead(args.requests)),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark signed access tokens.")
+    parser.add_argument("--iterations", type=int, default=20000, help="calls per timing of issue/verify")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per route for the dependency")
+    main(parser.parse_args())
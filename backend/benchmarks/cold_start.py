@@ -0,0 +1,86 @@
+"""
+Measures API cold start: a fresh interpreter importing the app module, and
+which heavy SDKs that pulls in. Each run is a new process, so nothing is
+cached in memory between runs (the OS file cache still is).
+
+Run from the repo root:
+    python -m backend.benchmarks.cold_start [--runs 10] [--module backend.main]
+
+To compare with an older version, check it out elsewhere and point --tree at it:
+    git worktree add /tmp/before <commit>
+    python -m backend.benchmarks.cold_start --tree /tmp/before
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+HEAVY_MODULES = ("cloudinary", "google.generativeai", "pypdf", "PIL.Image")
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+app = getattr({module}, "app")
+elapsed = time.perf_counter() - started
+print(json.dumps({{
+    "ms": elapsed * 1000,
+    "loaded": [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+# Older versions fail at import without these; no connection is made.
+_PLACEHOLDER_ENV = {
+    "MONGO_URI": "mongodb://localhost:27017",
+    "CLOUDINARY_CLOUD_NAME": "placeholder",
+    "CLOUDINARY_API_KEY": "placeholder",
+    "CLOUDINARY_API_SECRET": "placeholder",
+}
+
+
+def measure(tree: Path, module: str, runs: int) -> dict:
+    env = {**_PLACEHOLDER_ENV, **os.environ, "PYTHONPATH": str(tree), "PYTHONWARNINGS": "ignore"}
+    code = _PROBE.format(module=module, heavy=HEAVY_MODULES)
+    timings = []
+    loaded = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=tree,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        timings.append(result["ms"])
+        loaded = result["loaded"]
+    return {
+        "tree": str(tree),
+        "module": module,
+        "median_ms": round(statistics.median(timings), 1),
+        "min_ms": round(min(timings), 1),
+        "max_ms": round(max(timings), 1),
+        "heavy_modules_loaded": loaded,
+    }
+
+
+def main(args) -> None:
+    here = Path(__file__).resolve().parents[2]
+    trees = [Path(args.tree).resolve(), here] if args.tree else [here]
+    results = [measure(tree, args.module, args.runs) for tree in trees]
+    for result in results:
+        print(json.dumps(result))
+    if len(results) == 2 and results[1]["median_ms"]:
+        print(f"speedup: {results[0]['median_ms'] / results[1]['median_ms']:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark API import/startup time.")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--module", default="backend.main")
+    parser.add_argument("--tree", help="another checkout to compare against")
+    main(parser.parse_args())
@@ -0,0 +1,345 @@
+"""
+Load test for the API: drives each scenario with concurrent requests and
+reports p50/p95/p99 latency and requests per second as JSON.
+
+By default the app runs in this process against an in-memory Mongo (see
+memory_mongo), with Cloudinary and Gemini replaced by stubs that only wait
+--cloudinary-latency / --gemini-latency seconds. Use --mongo env to use
+MONGO_URI instead, or --base-url to load a server that is already running
+(its own Mongo and backends are used then).
+
+Run from the repo root:
+    python -m backend.benchmarks.load_test [--scenarios search notes] [--requests 200] [--concurrency 20]
+    python -m backend.benchmarks.load_test --output run.json --baseline baseline.json
+    python -m backend.benchmarks.load_test --baseline baseline.json --save-baseline
+
+With --baseline, exits with status 1 if any scenario's p95 or throughput is
+more than --tolerance worse than the baseline.
+
+The app's own limits apply: bcrypt and upload pools answer 429/503 when full
+(reported under "error_kinds"), and summaries go through the summarizer's
+rate limiter (SUMMARIZER_RATE_PER_SECOND). With --mongo env the fixtures are
+inserted into DB_NAME, so point it at a scratch database.
+"""
+import argparse
+import asyncio
+import io
+import itertools
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+SCENARIOS = ("auth", "search", "classes", "feed", "notes", "upload", "summary")
+
+_WORDS = ["Biology", "Chemistry", "Calculus", "History", "Physics", "Economics", "Data", "Art"]
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    # Nearest-rank percentile.
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies: list[float], errors: dict[str, int], elapsed: float) -> dict:
+    ordered = sorted(latencies)
+    ms = lambda seconds: round(seconds * 1000, 2)
+    total = len(latencies) + sum(errors.values())
+    return {
+        "requests": total,
+        "errors": sum(errors.values()),
+        # e.g. {"429": 3}: status codes, or exception names for other failures.
+        "error_kinds": errors,
+        "rps": round(total / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": ms(statistics.fmean(ordered)) if ordered else 0.0,
+        "p50_ms": ms(percentile(ordered, 50)),
+        "p95_ms": ms(percentile(ordered, 95)),
+        "p99_ms": ms(percentile(ordered, 99)),
+    }
+
+
+def sample_jpeg() -> bytes:
+    from PIL import Image, ImageDraw
+
+    image = Image.new("RGB", (1600, 1200), "white")
+    draw = ImageDraw.Draw(image)
+    for y in range(40, 1200, 40):
+        draw.line([(60, y), (1540, y)], fill=(40, 40, 40), width=2)
+    out = io.BytesIO()
+    image.save(out, format="JPEG", quality=90)
+    return out.getvalue()
+
+
+def install_stubs(cloudinary_latency: float, gemini_latency: float) -> None:
+    """Stand-ins for Cloudinary and Gemini; must run before the app is imported."""
+    os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+    os.environ.setdefault("AUTH_TOKEN_SECRET", "load-test")
+    for name in ("CLOUDINARY_CLOUD_NAME", "CLOUDINARY_API_KEY", "CLOUDINARY_API_SECRET"):
+        os.environ.setdefault(name, "load-test")
+    os.environ["SUMMARIZER_BACKEND"] = "local"
+    os.environ["SUMMARIZER_LOCAL_LATENCY_SECONDS"] = str(gemini_latency)
+
+    import cloudinary.uploader
+
+    counter = itertools.count()
+
+    def upload_large(file, **options):
+        while file.read(1024 * 1024):
+            pass
+        time.sleep(cloudinary_latency)
+        public_id = f"notes-app/load-test-{next(counter)}"
+        return {"public_id": public_id, "secure_url": f"https://example.invalid/{public_id}"}
+
+    cloudinary.uploader.upload_large = upload_large
+
+
+async def seed(classes: int, notes_per_class: int) -> dict:
+    from bson import ObjectId
+
+    from backend.database import classes_collection, notes_collection, users_collection
+    from backend.services.search_service import search_fields
+
+    user_docs = [
+        {"_id": ObjectId(), "email": f"user{j}@example.com", "classIds": []}
+        for j in range(40)
+    ]
+    class_docs = []
+    note_docs = []
+    for i in range(classes):
+        name = f"{_WORDS[i % len(_WORDS)]} {100 + i}"
+        class_id = ObjectId()
+        members = user_docs[i % 7::7]
+        for user in members:
+            user["classIds"].append(class_id)
+        class_docs.append({
+            "_id": class_id,
+            "name": name,
+            "users": [str(user["_id"]) for user in members],
+            "createdAt": "2024-01-01T00:00:00",
+            **search_fields(name),
+        })
+        for n in range(notes_per_class):
+            note_docs.append({
+                "_id": ObjectId(),
+                "class_id": class_id,
+                "imageUrl": f"https://example.invalid/{class_id}/{n}.jpg",
+                "pdfUrl": f"https://example.invalid/{class_id}/{n}.pdf",
+                "uploadedBy": f"user{n % 40}@example.com",
+                "uploadedAt": f"2024-01-01T00:{n // 60 % 60:02d}:{n % 60:02d}",
+                "summary": None,
+            })
+
+    await users_collection.insert_many(user_docs)
+    await classes_collection.insert_many(class_docs)
+    if note_docs:
+        await notes_collection.insert_many(note_docs)
+    return {
+        "class_ids": [str(doc["_id"]) for doc in class_docs],
+        "users": [(user["email"], str(user["_id"])) for user in user_docs],
+    }
+
+
+def scenario_requests(name: str, fixtures: dict):
+    """Returns an async function that performs one operation of the scenario."""
+    from backend.services.token_service import issue_token
+
+    class_ids = fixtures["class_ids"]
+    counter = itertools.count()
+    # Signed here, so --base-url needs the server's AUTH_TOKEN_SECRET in the
+    # environment. Nothing is seeded there, so those lists come back empty.
+    tokens = [
+        {"Authorization": f"Bearer {issue_token(email, user_id)}"}
+        for email, user_id in fixtures.get("users") or [("user0@example.com", "0" * 24)]
+    ]
+
+    async def auth(client):
+        i = next(counter)
+        email = f"load-{fixtures['run']}-{i}@example.com"
+        body = {"email": email, "password": "load-test-password"}
+        r = await client.post("/api/auth/signup", json=body)
+        r.raise_for_status()
+        r = await client.post("/api/auth/login", json=body)
+        r.raise_for_status()
+
+    async def search(client):
+        word = _WORDS[next(counter) % len(_WORDS)]
+        r = await client.get("/api/classes/search", params={"name": word[:4].lower()})
+        r.raise_for_status()
+
+    async def classes(client):
+        r = await client.get("/api/classes", headers=tokens[next(counter) % len(tokens)])
+        r.raise_for_status()
+
+    async def feed(client):
+        r = await client.get("/api/feed", headers=tokens[next(counter) % len(tokens)])
+        r.raise_for_status()
+
+    async def notes(client):
+        class_id = class_ids[next(counter) % len(class_ids)]
+        r = await client.get("/api/notes", params={"class_id": class_id, "limit": 20})
+        r.raise_for_status()
+
+    async def upload(client):
+        class_id = class_ids[next(counter) % len(class_ids)]
+        metadata = {"class_id": class_id, "uploaded_by": "user0@example.com"}
+        r = await client.post(
+            "/api/upload-to-pdf-and-save",
+            files={"file": ("page.jpg", fixtures["jpeg"], "image/jpeg")},
+            data={"metadata": json.dumps(metadata)},
+        )
+        r.raise_for_status()
+
+    async def summary(client):
+        # Distinct PDFs, so every job goes to the summarizer instead of the cache.
+        pdf = fixtures["pdf"] + f"\n% {fixtures['run']}-{next(counter)}\n".encode()
+        r = await client.post(
+            "/api/summaries",
+            files={"file": ("notes.pdf", pdf, "application/pdf")},
+        )
+        r.raise_for_status()
+        job = r.json()
+        while job["status"] not in ("done", "failed"):
+            await asyncio.sleep(0.02)
+            r = await client.get(f"/api/summaries/{job['job_id']}")
+            r.raise_for_status()
+            job = r.json()
+        if job["status"] == "failed":
+            raise RuntimeError(job.get("error"))
+
+    return {
+        "auth": auth,
+        "search": search,
+        "classes": classes,
+        "feed": feed,
+        "notes": notes,
+        "upload": upload,
+        "summary": summary,
+    }[name]
+
+
+async def run_scenario(client, operation, requests: int, concurrency: int) -> dict:
+    import httpx
+
+    latencies: list[float] = []
+    errors: dict[str, int] = {}
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                await operation(client)
+            except httpx.HTTPStatusError as e:
+                kind = str(e.response.status_code)
+                errors[kind] = errors.get(kind, 0) + 1
+                continue
+            except Exception as e:
+                kind = type(e).__name__
+                errors[kind] = errors.get(kind, 0) + 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for name, current in results["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        if before["p95_ms"] and current["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {before['p95_ms']}ms -> {current['p95_ms']}ms")
+        if before["rps"] and current["rps"] < before["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: rps {before['rps']} -> {current['rps']}")
+    return regressions
+
+
+async def main(args) -> int:
+    import httpx
+
+    from backend.benchmarks.pdf_extract import synthetic_pdf
+
+    config = {
+        key: getattr(args, key)
+        for key in ("requests", "concurrency", "mongo", "base_url", "classes",
+                    "notes_per_class", "cloudinary_latency", "gemini_latency")
+    }
+    results = {"config": config, "scenarios": {}}
+
+    async def run_all(client, fixtures):
+        for name in args.scenarios:
+            operation = scenario_requests(name, fixtures)
+            # A short warm-up so pools, caches and lazy imports are in place.
+            await run_scenario(client, operation, min(5, args.requests), 1)
+            results["scenarios"][name] = await run_scenario(
+                client, operation, args.requests, args.concurrency
+            )
+            print(name, json.dumps(results["scenarios"][name]), file=sys.stderr)
+
+    fixtures = {"run": int(time.time()), "jpeg": sample_jpeg(), "pdf": synthetic_pdf(12)}
+
+    if args.base_url:
+        async with httpx.AsyncClient(base_url=args.base_url, timeout=120) as client:
+            r = await client.get("/api/classes/search", params={"name": "a", "limit": 50})
+            fixtures["class_ids"] = [c["id"] for c in r.json()] or ["000000000000000000000000"]
+            await run_all(client, fixtures)
+    else:
+        install_stubs(args.cloudinary_latency, args.gemini_latency)
+        if args.mongo == "memory":
+            from backend.benchmarks.memory_mongo import install
+
+            install()
+
+        from backend.main import app
+
+        async with app.router.lifespan_context(app):
+            fixtures.update(await seed(args.classes, args.notes_per_class))
+            from backend.services.search_service import class_search_index
+
+            await class_search_index.load()
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=120) as client:
+                await run_all(client, fixtures)
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+    if args.baseline:
+        baseline_path = Path(args.baseline)
+        if args.save_baseline:
+            baseline_path.write_text(json.dumps(results, indent=2))
+            print(f"Saved baseline to {baseline_path}", file=sys.stderr)
+        elif baseline_path.exists():
+            regressions = compare(results, json.loads(baseline_path.read_text()), args.tolerance)
+            for line in regressions:
+                print("REGRESSION", line, file=sys.stderr)
+            return 1 if regressions else 0
+        else:
+            print(f"No baseline at {baseline_path}; use --save-baseline to create it", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the API.")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=200, help="operations per scenario")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--mongo", choices=("memory", "env"), default="memory")
+    parser.add_argument("--base-url", help="load a running server instead of an in-process app")
+    parser.add_argument("--classes", type=int, default=200, help="classes to seed")
+    parser.add_argument("--notes-per-class", type=int, default=30)
+    parser.add_argument("--cloudinary-latency", type=float, default=0.2, help="seconds per stub upload")
+    parser.add_argument("--gemini-latency", type=float, default=0.5, help="seconds per stub model call")
+    parser.add_argument("--output", help="also write the JSON report here")
+    parser.add_argument("--baseline", help="baseline report to compare against (or save with --save-baseline)")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression")
+    sys.exit(asyncio.run(main(parser.parse_args())))
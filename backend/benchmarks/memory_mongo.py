@@ -0,0 +1,45 @@
+"""
+In-memory stand-in for MongoDB, for load tests that should not need a server.
+
+Uses mongomock-motor (pip install mongomock-motor), which is not part of the
+API's requirements. Numbers measured against it are only comparable with each
+other: mongomock runs queries in pure Python on the event loop.
+"""
+from backend import database
+
+
+def _lookup_with_pipeline(handle_lookup, process_pipeline):
+    # mongomock only implements localField/foreignField lookups. This adds the
+    # form the API uses, localField/foreignField plus a sub-pipeline.
+    def handler(in_collection, db, options):
+        if "pipeline" not in options:
+            return handle_lookup(in_collection, db, options)
+
+        foreign = db.get_collection(options["from"])
+        out = []
+        for doc in in_collection:
+            value = doc.get(options["localField"])
+            query = {options["foreignField"]: {"$in": value} if isinstance(value, list) else value}
+            matches = list(foreign.find(query))
+            out.append({**doc, options["as"]: list(process_pipeline(matches, db, options["pipeline"], None))})
+        return out
+
+    return handler
+
+
+def install() -> None:
+    """Makes backend.database hand out an in-memory client. Call before connect()."""
+    try:
+        import mongomock_motor
+        from mongomock import aggregate
+    except ImportError as e:
+        raise SystemExit("The in-memory Mongo needs mongomock-motor: pip install mongomock-motor") from e
+
+    handlers = aggregate._PIPELINE_HANDLERS
+    handlers["$lookup"] = _lookup_with_pipeline(handlers["$lookup"], aggregate.process_pipeline)
+
+    # mongomock_motor's with_options returns a synchronous collection.
+    mongomock_motor.AsyncMongoMockCollection.with_options = lambda self, **kwargs: self
+
+    database.close()
+    database.AsyncIOMotorClient = mongomock_motor.AsyncMongoMockClient
@@ -0,0 +1,118 @@
+"""
+Compares PDF text extraction modes on synthetic text PDFs of 10 to 500 pages:
+the old `text +=` loop, the page generator, the process-pool mode and a
+cache hit.
+
+Run from the repo root:
+    python -m backend.benchmarks.pdf_extract [--pages 10 50 100 250 500] [--repeat 3]
+"""
+import argparse
+import asyncio
+import io
+import time
+
+from pypdf import PdfReader
+
+from backend.utils import pdf_utils
+
+_LINE = "Lecture notes line %d on page %d: the quick brown fox jumps over the lazy dog."
+
+
+def synthetic_pdf(pages: int, lines_per_page: int = 40) -> bytes:
+    """A text-layer PDF with `pages` pages of Helvetica text."""
+    # 1: catalog, 2: pages, 3: font, then a content stream and a page per page.
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for page in range(pages):
+        lines = b"".join(
+            b"(%s) Tj T*\n" % (_LINE % (line, page)).encode()
+            for line in range(lines_per_page)
+        )
+        content = b"BT /F1 10 Tf 12 TL 40 800 Td\n" + lines + b"ET"
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects)
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids),
+        pages,
+    )
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref_at = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_at))
+    return out.getvalue()
+
+
+def concat_baseline(file_bytes: bytes) -> str:
+    # The previous extract_text_from_pdf.
+    reader = PdfReader(io.BytesIO(file_bytes))
+    text = ""
+    for page in reader.pages:
+        text += page.extract_text() or ""
+    return text
+
+
+def generator_mode(file_bytes: bytes) -> str:
+    return "".join(pdf_utils.iter_page_text(file_bytes))
+
+
+def best_of(repeat: int, fn) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+async def main(page_counts: list[int], repeat: int) -> None:
+    # Start the worker processes before timing anything.
+    await pdf_utils.pdf_executor.run(pdf_utils.page_count, synthetic_pdf(1))
+
+    print(f"{'pages':>6} {'concat':>9} {'generator':>10} {'parallel':>9} {'cached':>9} {'speedup':>8}")
+    for pages in page_counts:
+        pdf = synthetic_pdf(pages)
+
+        concat = best_of(repeat, lambda: concat_baseline(pdf))
+        generator = best_of(repeat, lambda: generator_mode(pdf))
+
+        parallel_timings = []
+        for _ in range(repeat):
+            pdf_utils.page_text_cache = pdf_utils.PageTextCache(pdf_utils.PDF_TEXT_CACHE_MAX_BYTES)
+            started = time.perf_counter()
+            texts = await pdf_utils.extract_pages_parallel(pdf)
+            parallel_timings.append(time.perf_counter() - started)
+        parallel = min(parallel_timings)
+        assert "".join(texts) == concat_baseline(pdf)
+
+        cached = best_of(repeat, lambda: pdf_utils.extract_pages(pdf))
+
+        print(
+            f"{pages:>6} {concat * 1000:>7.0f}ms {generator * 1000:>8.0f}ms "
+            f"{parallel * 1000:>7.0f}ms {cached * 1000:>7.1f}ms {concat / parallel:>7.1f}x"
+        )
+
+    pdf_utils.pdf_executor.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark PDF text extraction modes.")
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 50, 100, 250, 500])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.pages, args.repeat))
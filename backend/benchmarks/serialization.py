@@ -0,0 +1,129 @@
+"""
+Measures API-process CPU per list response for 10, 1,000 and 10,000 notes,
+serialized three ways:
+
+  model:  the old path; documents rebuilt with note_to_out, then validated
+          against the NotePage response_model and encoded with stdlib json.
+  fast:   documents as NOTE_OUT_PROJECTION returns them, encoded with orjson
+          and sent as-is (what GET /api/notes does on a cache miss).
+  cached: a response_cache hit, which sends the stored bytes.
+
+Each request goes through a minimal FastAPI app, so the numbers include the
+framework's own per-request cost. Shaping in the query costs the database
+some CPU instead; that is not counted here.
+
+Run from the repo root:
+    python -m backend.benchmarks.serialization [--sizes 10 1000 10000] [--runs 20]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from bson import ObjectId
+
+
+def raw_notes(count: int) -> list[dict]:
+    # Stored documents, as a plain find() returned them.
+    class_id = ObjectId()
+    return [
+        {
+            "_id": ObjectId(),
+            "class_id": class_id,
+            "imageUrl": f"https://res.cloudinary.com/demo/image/upload/notes-app/{i}.jpg",
+            "pdfUrl": f"https://res.cloudinary.com/demo/raw/upload/notes-app/{i}.pdf",
+            "uploadedBy": f"user{i % 50}@example.com",
+            "uploadedAt": f"2024-03-{1 + i % 28:02d}T12:{i % 60:02d}:00",
+            "summary": "Cell structure, membranes and transport. " * 3 if i % 4 == 0 else None,
+        }
+        for i in range(count)
+    ]
+
+
+def projected_notes(raw: list[dict]) -> list[dict]:
+    # The same documents after NOTE_OUT_PROJECTION: API shape plus _id for paging.
+    return [
+        {
+            "_id": note["_id"],
+            "id": str(note["_id"]),
+            "imageUrl": note["imageUrl"],
+            "pdfUrl": note["pdfUrl"],
+            "pageCount": None,
+            "uploadedBy": note["uploadedBy"],
+            "uploadedAt": note["uploadedAt"],
+            "summary": note["summary"],
+        }
+        for note in raw
+    ]
+
+
+async def cpu_ms(client, path: str, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.process_time()
+        r = await client.get(path)
+        timings.append(time.process_time() - started)
+        r.raise_for_status()
+    return round(statistics.median(timings) * 1000, 3)
+
+
+async def measure(count: int, runs: int) -> dict:
+    import httpx
+    from fastapi import FastAPI, Request
+
+    from backend.models.note_model import NotePage
+    from backend.services.note_service import note_to_out
+    from backend.utils.fast_json import json_response
+    from backend.utils.response_cache import ResponseCache
+
+    raw = raw_notes(count)
+    # One fresh copy per request, since the fast path strips _id in place.
+    pending = [[dict(note) for note in projected_notes(raw)] for _ in range(runs + 1)]
+    cache = ResponseCache(ttl=3600, max_bytes=1 << 30)
+
+    app = FastAPI()
+
+    @app.get("/model", response_model=NotePage)
+    async def model_route():
+        return {"notes": [note_to_out(note) for note in raw], "nextCursor": None}
+
+    @app.get("/fast", response_model=NotePage)
+    async def fast_route():
+        notes = pending.pop()
+        for note in notes:
+            del note["_id"]
+        return json_response({"notes": notes, "nextCursor": None})
+
+    @app.get("/cached", response_model=NotePage)
+    async def cached_route(request: Request):
+        async def load():
+            return {"notes": [note_to_out(note) for note in raw], "nextCursor": None}
+
+        return await cache.respond(request, "notes", load, tags=lambda data: [])
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+        model_body = (await client.get("/model")).json()
+        fast_body = (await client.get("/fast")).json()
+        assert model_body == fast_body, "fast path must send the same JSON as the model path"
+        await client.get("/cached")
+
+        results = {"notes": count}
+        for name in ("model", "fast", "cached"):
+            results[f"{name}_cpu_ms"] = await cpu_ms(client, f"/{name}", runs)
+    results["fast_speedup"] = round(results["model_cpu_ms"] / results["fast_cpu_ms"], 1)
+    return results
+
+
+def main(args) -> None:
+    for count in args.sizes:
+        runs = args.runs if count < 10000 else max(3, args.runs // 4)
+        print(json.dumps(asyncio.run(measure(count, runs))))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark list response serialization.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000])
+    parser.add_argument("--runs", type=int, default=20, help="requests per path (a quarter for 10k notes)")
+    main(parser.parse_args())
@@ -1,7 +1,11 @@
 import os
+import threading
 from motor.motor_asyncio import AsyncIOMotorClient
 from dotenv import load_dotenv
 from pathlib import Path
+from pymongo import ReadPreference, monitoring
+
+from backend.utils.metrics import MongoCommandMetrics, register_pool_collector
 
 env_path = Path(__file__).resolve().parent / ".env"
 load_dotenv(env_path)
@@ -9,14 +13,182 @@ load_dotenv(env_path)
 MONGO_URI = os.getenv("MONGO_URI")
 DB_NAME = os.getenv("DB_NAME", "notes_app")
 
-if not MONGO_URI:
-    raise RuntimeError("MONGO_URI is missing. Add it to backend/.env")
+# Connection pool and timeouts, per API process.
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "5"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "60000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "20000"))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "5000"))
+# Set to e.g. "secondaryPreferred" to let uncached list reads (class search)
+# go to secondaries, which can lag behind by the replication delay. Cached
+# reads always use the primary: the reload after a write invalidates the
+# cache must see that write, or the stale result is cached for the full TTL.
+MONGO_LIST_READ_PREFERENCE = os.getenv("MONGO_LIST_READ_PREFERENCE", "primary")
+
+_READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primaryPreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondaryPreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST,
+}
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Connection pool counters, fed by pymongo's pool events."""
+
+    def __init__(self):
+        # Events arrive on pymongo's threads.
+        self._lock = threading.Lock()
+        self.in_use = 0
+        self.open = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.cleared = 0
+
+    def _waited(self, seconds: float) -> None:
+        self.wait_total += seconds
+        self.wait_max = max(self.wait_max, seconds)
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            self.in_use += 1
+            self.checkouts += 1
+            self._waited(event.duration)
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.checkout_failures += 1
+            self._waited(event.duration)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.in_use -= 1
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open -= 1
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.cleared += 1
+
+    def pool_created(self, event): pass
+    def pool_ready(self, event): pass
+    def pool_closed(self, event): pass
+    def connection_ready(self, event): pass
+    def connection_check_out_started(self, event): pass
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            waits = self.checkouts + self.checkout_failures
+            return {
+                "in_use": self.in_use,
+                "open": self.open,
+                "max_pool_size": MONGO_MAX_POOL_SIZE,
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "checkout_wait_avg_ms": round(self.wait_total / waits * 1000, 2) if waits else 0.0,
+                "checkout_wait_max_ms": round(self.wait_max * 1000, 2),
+                "pool_cleared": self.cleared,
+            }
+
+
+pool_metrics = PoolMetrics()
+register_pool_collector(pool_metrics.snapshot)
+_client: AsyncIOMotorClient | None = None
+
+
+def connect() -> AsyncIOMotorClient:
+    """
+    Creates the client if there isn't one yet. The API calls this from its
+    lifespan; scripts get a client on first use of a collection.
+    """
+    global _client
+    if _client is None:
+        if not MONGO_URI:
+            raise RuntimeError("MONGO_URI is missing. Add it to backend/.env")
+        _client = AsyncIOMotorClient(
+            MONGO_URI,
+            maxPoolSize=MONGO_MAX_POOL_SIZE,
+            minPoolSize=MONGO_MIN_POOL_SIZE,
+            maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+            serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+            socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+            waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+            event_listeners=[pool_metrics, MongoCommandMetrics()],
+        )
+    return _client
+
+
+def close() -> None:
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+
+
+def get_db():
+    return connect()[DB_NAME]
+
+
+def pool_stats() -> dict:
+    return {"connected": _client is not None, **pool_metrics.snapshot()}
+
+
+class _Lazy:
+    """
+    Stands in for a database or collection, resolved from the current client
+    on use. Modules can import collections before the client exists, and keep
+    working after it has been closed and recreated.
+    """
+
+    def __init__(self, resolve):
+        self._resolve = resolve
+        self._client = None
+        self._target = None
+
+    def _get(self):
+        client = connect()
+        if client is not self._client:
+            self._target = self._resolve(client[DB_NAME])
+            self._client = client
+        return self._target
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+    def __getitem__(self, name):
+        return self._get()[name]
+
+
+def _collection(name: str, read_preference=None) -> _Lazy:
+    def resolve(database):
+        collection = database[name]
+        if read_preference is not None:
+            collection = collection.with_options(read_preference=read_preference)
+        return collection
+    return _Lazy(resolve)
 
-client = AsyncIOMotorClient(MONGO_URI)
 
 # Database
-db = client["notes_app"]
+db = _Lazy(lambda database: database)
 
 # Collections
-users_collection = db["users"]
-classes_collection = db["classes"]
\ No newline at end of file
+users_collection = _collection("users")
+classes_collection = _collection("classes")
+notes_collection = _collection("notes")
+summary_jobs_collection = _collection("summary_jobs")
+summary_cache_collection = _collection("summary_cache")
+
+# Classes for uncached list reads (search), read per MONGO_LIST_READ_PREFERENCE.
+classes_list_collection = _collection("classes", _READ_PREFERENCES[MONGO_LIST_READ_PREFERENCE])
@@ -0,0 +1,140 @@
+"""
+Indexes the API relies on, and a check that its hot queries actually use them.
+
+ensure_indexes() runs at startup. To check query plans without starting the
+app, run from the repo root:
+    python -m backend.indexes --explain
+It exits with status 1 if any canonical query is planned as a COLLSCAN. Set
+VERIFY_QUERY_PLANS=1 to run the same check during startup.
+"""
+import argparse
+import asyncio
+import os
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from backend.database import (
+    classes_collection,
+    notes_collection,
+    summary_jobs_collection,
+    users_collection,
+)
+
+VERIFY_QUERY_PLANS = os.getenv("VERIFY_QUERY_PLANS", "").lower() in ("1", "true", "yes")
+
+INDEXES = [
+    # Every auth route looks users up by email; unique also closes the
+    # check-then-insert race in signup.
+    (users_collection, [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ]),
+    (classes_collection, [
+        # Classes by member id (multikey); drops and enrollment repairs.
+        IndexModel([("users", ASCENDING)], name="users"),
+        # Note lookups in classes that still embed photos (multikey).
+        IndexModel([("photos._id", ASCENDING)], name="photos_id"),
+        # Fuzzy class search (multikey).
+        IndexModel([("nameTrigrams", ASCENDING)], name="nameTrigrams"),
+    ]),
+    (notes_collection, [
+        IndexModel(
+            [("class_id", ASCENDING), ("uploadedAt", ASCENDING), ("_id", ASCENDING)],
+            name="class_uploadedAt_id",
+        ),
+    ]),
+    (summary_jobs_collection, [
+        # Workers claim the oldest queued (or stale running) job.
+        IndexModel([("status", ASCENDING), ("createdAt", ASCENDING)], name="status_createdAt"),
+    ]),
+]
+
+
+async def ensure_indexes() -> None:
+    for collection, models in INDEXES:
+        try:
+            await collection.create_indexes(models)
+        except OperationFailure as e:
+            # Usually duplicate emails left over from before the unique
+            # index; the app still works, so report it instead of refusing
+            # to start.
+            print(f"⚠️ Could not create indexes on {collection.name}: {e}")
+
+
+def canonical_queries() -> dict:
+    """One representative query per route family, as (collection, filter, sort)."""
+    some_id = ObjectId()
+    return {
+        "auth: user by email": (users_collection, {"email": "someone@example.com"}, None),
+        "enrollment: class list of a user": (users_collection, {"_id": some_id}, None),
+        "classes: classes of a user": (
+            classes_collection,
+            {"_id": {"$in": [some_id]}, "users": str(some_id)},
+            None,
+        ),
+        "classes: class by id": (classes_collection, {"_id": some_id}, None),
+        "classes: fuzzy search": (classes_collection, {"nameTrigrams": {"$in": ["  b", " bi", "bio"]}}, None),
+        "notes: page of a class": (
+            notes_collection,
+            {"class_id": some_id},
+            [("uploadedAt", DESCENDING), ("_id", DESCENDING)],
+        ),
+        "notes: single note": (notes_collection, {"_id": some_id, "class_id": some_id}, None),
+        "notes: embedded note": (classes_collection, {"photos._id": some_id}, None),
+        "summaries: next queued job": (
+            summary_jobs_collection,
+            {"status": "queued"},
+            [("createdAt", ASCENDING)],
+        ),
+    }
+
+
+def _stages(plan: dict):
+    yield plan.get("stage")
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            yield from _stages(plan[key])
+    for child in plan.get("inputStages", []):
+        yield from _stages(child)
+
+
+async def explain_queries() -> dict[str, list[str]]:
+    plans = {}
+    for name, (collection, query, sort) in canonical_queries().items():
+        cursor = collection.find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explained = await cursor.explain()
+        winning = explained["queryPlanner"]["winningPlan"]
+        plans[name] = [stage for stage in _stages(winning) if stage]
+    return plans
+
+
+async def verify_query_plans() -> None:
+    """Raises RuntimeError naming every canonical query that scans a collection."""
+    plans = await explain_queries()
+    scans = [name for name, stages in plans.items() if "COLLSCAN" in stages]
+    if scans:
+        raise RuntimeError(f"Queries planned as COLLSCAN: {', '.join(scans)}")
+
+
+async def main(explain: bool) -> int:
+    await ensure_indexes()
+    print("✅ Indexes ensured")
+    if not explain:
+        return 0
+
+    failed = False
+    for name, stages in (await explain_queries()).items():
+        scan = "COLLSCAN" in stages
+        failed = failed or scan
+        print(f"{'❌' if scan else '✅'} {name}: {' <- '.join(stages)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create indexes and check query plans.")
+    parser.add_argument("--explain", action="store_true", help="explain canonical queries and fail on COLLSCAN")
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(main(args.explain)))
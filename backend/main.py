@@ -1,29 +1,100 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from backend import database
+from backend.indexes import VERIFY_QUERY_PLANS, ensure_indexes, verify_query_plans
+from backend.utils.body_limit import MaxBodySizeMiddleware
+from backend.utils.metrics import MetricsMiddleware, render_metrics
 from backend.routes.auth_routes import router as auth_router
 from backend.routes.class_routes import router as class_router
+from backend.routes.feed_routes import router as feed_router
 from backend.routes.notes_routes import router as notes_router
 from backend.routes.summary_routes import router as summary_router
 from backend.routes.upload_routes import router as upload_router
+from backend.services.search_service import backfill_search_fields, class_search_index
+from backend.services.upload_service import (
+    LECTURE_MAX_PAGES,
+    UPLOAD_BATCH_MAX_FILES,
+    UPLOAD_MAX_BYTES,
+)
+from backend.services.summary_job_service import summary_job_queue
+from backend.services.token_service import signing_key
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Refuse to start without a token secret rather than fail on first login.
+    signing_key()
+    database.connect()
+    await ensure_indexes()
+    if VERIFY_QUERY_PLANS:
+        await verify_query_plans()
+    await backfill_search_fields()
+    await class_search_index.load()
+    class_search_index.start()
+    summary_job_queue.start()
+    yield
+    await summary_job_queue.stop()
+    await class_search_index.stop()
+    database.close()
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
 
-@app.get("/")
-def health():
-    return {"status": "Backend running"}
+def create_app() -> FastAPI:
+    """
+    Builds the API. Cloudinary, Gemini and pypdf (and their credentials) are
+    only loaded by the first request that needs them, so this stays fast and
+    works without them.
+
+    Run with `uvicorn backend.main:app` or `uvicorn backend.main:create_app --factory`.
+    """
+    app = FastAPI(lifespan=lifespan)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Cut off oversized uploads before they are spooled; the slack covers the
+    # multipart framing and metadata around the files themselves.
+    app.add_middleware(
+        MaxBodySizeMiddleware,
+        limits={
+            "/api/upload": UPLOAD_MAX_BYTES + 64 * 1024,
+            "/api/upload-lecture": LECTURE_MAX_PAGES * UPLOAD_MAX_BYTES + 64 * 1024,
+            "/api/upload-to-pdf-and-save-batch": UPLOAD_BATCH_MAX_FILES * UPLOAD_MAX_BYTES + 64 * 1024,
+        },
+    )
+
+    # Added last so it is outermost and its timings include the other middleware.
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/")
+    def health():
+        return {"status": "Backend running"}
+
+    # Mongo connection pool usage and checkout waits for this process
+    @app.get("/api/db-metrics")
+    def db_metrics():
+        return database.pool_stats()
+
+    # Prometheus scrape endpoint (route, Mongo and Cloudinary/Gemini timings)
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        body, content_type = render_metrics()
+        return Response(content=body, media_type=content_type)
+
+    app.include_router(auth_router, prefix="/api")
+    app.include_router(class_router, prefix="/api")
+    app.include_router(feed_router, prefix="/api")
+    app.include_router(notes_router, prefix="/api")
+    app.include_router(summary_router, prefix="/api")
+    app.include_router(upload_router, prefix="/api")
+
+    return app
 
-app.include_router(auth_router, prefix="/api")
-app.include_router(class_router, prefix="/api")
-app.include_router(notes_router, prefix="/api")
-app.include_router(summary_router, prefix="/api")
-app.include_router(upload_router, prefix="/api")
 
+app = create_app()
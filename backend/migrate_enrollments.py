@@ -0,0 +1,155 @@
+"""
+Moves class memberships from emails to stable user ids, and builds each
+user's class list (users.classIds) from them. See enrollment_service.
+
+Safe to run while the API is serving traffic. Each class's member list is
+only replaced if it hasn't changed since it was read (otherwise it is read
+again), and adding a class to a user's list is idempotent, so the script can
+be stopped and re-run at any point. Progress is checkpointed in the
+migrations collection; --restart goes over every class again, which also
+repairs user lists that drifted from classes.users.
+
+Emails with no matching user are left in place and reported.
+
+Run from the repo root:
+    python -m backend.migrate_enrollments [--batch-size 500] [--restart] [--dry-run]
+"""
+import argparse
+import asyncio
+from datetime import datetime
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from backend.database import classes_collection, db, users_collection
+from backend.indexes import ensure_indexes
+from backend.services.enrollment_service import user_object_ids
+
+MIGRATION_ID = "enrollments_by_user_id"
+migrations_collection = db["migrations"]
+
+
+async def member_ids(members: list) -> tuple[list, list]:
+    """Maps a class's member entries to user ids; returns (ids, entries with no user)."""
+    oids = user_object_ids(members)
+    known_ids = {
+        str(user["_id"])
+        async for user in users_collection.find({"_id": {"$in": oids}}, {"_id": 1})
+    }
+    emails = [member for member in members if member not in known_ids]
+    id_by_email = {
+        user["email"]: str(user["_id"])
+        async for user in users_collection.find({"email": {"$in": emails}}, {"email": 1})
+    }
+
+    ids, unknown = [], []
+    for member in members:
+        user_id = member if member in known_ids else id_by_email.get(member)
+        if user_id is None:
+            unknown.append(member)
+            user_id = member
+        if user_id not in ids:
+            ids.append(user_id)
+    return ids, unknown
+
+
+async def migrate_class(class_id: ObjectId, batch_size: int, dry_run: bool) -> tuple[int, list]:
+    while True:
+        class_doc = await classes_collection.find_one({"_id": class_id}, {"users": 1})
+        if class_doc is None:
+            return 0, []
+        members = class_doc.get("users", [])
+        ids, unknown = await member_ids(members)
+        if dry_run or ids == members:
+            break
+        # Only if no one joined or dropped since the read; otherwise redo it.
+        result = await classes_collection.update_one(
+            {"_id": class_id, "users": members},
+            {"$set": {"users": ids}},
+        )
+        if result.modified_count:
+            break
+
+    user_oids = user_object_ids(ids)
+    for start in range(0, len(user_oids), batch_size):
+        if dry_run:
+            continue
+        await users_collection.bulk_write(
+            [
+                UpdateOne({"_id": user_oid}, {"$addToSet": {"classIds": class_id}})
+                for user_oid in user_oids[start:start + batch_size]
+            ],
+            ordered=False,
+        )
+    return len(user_oids), unknown
+
+
+async def prune_user_lists(dry_run: bool) -> int:
+    # Classes a user's list still names but that no longer list the user
+    # (deleted, or a drop whose second write was lost).
+    pruned = 0
+    async for user in users_collection.find({"classIds.0": {"$exists": True}}, {"classIds": 1}):
+        user_id = str(user["_id"])
+        current = {
+            doc["_id"]
+            async for doc in classes_collection.find(
+                {"_id": {"$in": user["classIds"]}, "users": user_id}, {"_id": 1}
+            )
+        }
+        stale = [class_id for class_id in user["classIds"] if class_id not in current]
+        if stale and not dry_run:
+            await users_collection.update_one({"_id": user["_id"]}, {"$pull": {"classIds": {"$in": stale}}})
+        pruned += len(stale)
+    return pruned
+
+
+async def main(batch_size: int, restart: bool, dry_run: bool) -> None:
+    await ensure_indexes()
+
+    state = await migrations_collection.find_one({"_id": MIGRATION_ID})
+    query = {"users.0": {"$exists": True}}
+    if state and state.get("lastClassId") and not restart:
+        query["_id"] = {"$gt": state["lastClassId"]}
+        print(f"Resuming after class {state['lastClassId']}")
+
+    classes_done = 0
+    enrollments = 0
+    cursor = classes_collection.find(query, {"_id": 1}).sort("_id", 1)
+    async for class_doc in cursor:
+        members, unknown = await migrate_class(class_doc["_id"], batch_size, dry_run)
+        classes_done += 1
+        enrollments += members
+        print(f"- class {class_doc['_id']}: {members} member(s)")
+        if unknown:
+            print(f"  ! no user for {len(unknown)} member(s): {', '.join(map(str, unknown[:5]))}")
+
+        if not dry_run:
+            await migrations_collection.update_one(
+                {"_id": MIGRATION_ID},
+                {"$set": {
+                    "lastClassId": class_doc["_id"],
+                    "updatedAt": datetime.utcnow(),
+                }},
+                upsert=True,
+            )
+
+    pruned = await prune_user_lists(dry_run)
+
+    if not dry_run:
+        await migrations_collection.update_one(
+            {"_id": MIGRATION_ID},
+            {"$set": {"finishedAt": datetime.utcnow()}},
+            upsert=True,
+        )
+
+    verb = "Would record" if dry_run else "Recorded"
+    print(f"{verb} {enrollments} enrollment(s) in {classes_done} class(es); {pruned} stale list entry(s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Key class memberships by user id and build users' class lists.")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--restart", action="store_true", help="ignore the saved checkpoint (also repairs drift)")
+    parser.add_argument("--dry-run", action="store_true", help="only report what would change")
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size, args.restart, args.dry_run))
@@ -0,0 +1,100 @@
+"""
+Moves notes embedded in classes.photos into the notes collection.
+
+Safe to run while the API is serving traffic: the API already writes new notes
+to the notes collection and reads from both places. Each photo is upserted by
+its _id before being pulled from its class, so the script can be stopped and
+re-run at any point. Progress is checkpointed in the migrations collection.
+
+Run from the repo root:
+    python -m backend.migrate_notes [--batch-size 500] [--restart] [--dry-run]
+"""
+import argparse
+import asyncio
+from datetime import datetime
+
+from pymongo import UpdateOne
+
+from backend.database import classes_collection, db, notes_collection
+from backend.indexes import ensure_indexes
+
+MIGRATION_ID = "split_class_photos_into_notes"
+migrations_collection = db["migrations"]
+
+
+async def migrate_class(class_doc: dict, batch_size: int, dry_run: bool) -> int:
+    photos = [photo for photo in class_doc.get("photos", []) if "_id" in photo]
+    skipped = len(class_doc.get("photos", [])) - len(photos)
+    if skipped:
+        print(f"  ! {skipped} photo(s) without _id left in class {class_doc['_id']}")
+
+    for start in range(0, len(photos), batch_size):
+        batch = photos[start:start + batch_size]
+        if dry_run:
+            continue
+
+        await notes_collection.bulk_write(
+            [
+                UpdateOne(
+                    {"_id": photo["_id"]},
+                    {"$setOnInsert": {**photo, "class_id": class_doc["_id"]}},
+                    upsert=True,
+                )
+                for photo in batch
+            ],
+            ordered=False,
+        )
+        await classes_collection.update_one(
+            {"_id": class_doc["_id"]},
+            {"$pull": {"photos": {"_id": {"$in": [photo["_id"] for photo in batch]}}}},
+        )
+
+    return len(photos)
+
+
+async def main(batch_size: int, restart: bool, dry_run: bool) -> None:
+    await ensure_indexes()
+
+    state = await migrations_collection.find_one({"_id": MIGRATION_ID})
+    query = {"photos.0": {"$exists": True}}
+    if state and state.get("lastClassId") and not restart:
+        query["_id"] = {"$gt": state["lastClassId"]}
+        print(f"Resuming after class {state['lastClassId']}")
+
+    classes_done = 0
+    notes_moved = 0
+    cursor = classes_collection.find(query, {"photos": 1}).sort("_id", 1)
+    async for class_doc in cursor:
+        moved = await migrate_class(class_doc, batch_size, dry_run)
+        classes_done += 1
+        notes_moved += moved
+        print(f"- class {class_doc['_id']}: {moved} note(s)")
+
+        if not dry_run:
+            await migrations_collection.update_one(
+                {"_id": MIGRATION_ID},
+                {"$set": {
+                    "lastClassId": class_doc["_id"],
+                    "updatedAt": datetime.utcnow(),
+                }},
+                upsert=True,
+            )
+
+    if not dry_run:
+        await migrations_collection.update_one(
+            {"_id": MIGRATION_ID},
+            {"$set": {"finishedAt": datetime.utcnow()}},
+            upsert=True,
+        )
+
+    verb = "Would move" if dry_run else "Moved"
+    print(f"{verb} {notes_moved} note(s) from {classes_done} class(es)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move embedded class photos into the notes collection.")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--restart", action="store_true", help="ignore the saved checkpoint")
+    parser.add_argument("--dry-run", action="store_true", help="only report what would move")
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size, args.restart, args.dry_run))
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 
 # Pydantic Model of classes for FastAPI
@@ -16,6 +16,10 @@ class ClassCreate(BaseModel):
     users: List[str] = []
     photos: List[Note] = []
 
+# Several classes to join or drop in one request.
+class ClassIdsIn(BaseModel):
+    class_ids: List[str] = Field(min_length=1, max_length=100)
+
 # Defines what API sends back to the client. 
 class ClassOut(BaseModel):
     id: str
@@ -23,18 +27,44 @@ class ClassOut(BaseModel):
     users: List[str]
     photos: List[Note]
 
+# Small version of a note used in class listings.
+class NotePreview(BaseModel):
+    id: str
+    imageUrl: str
+    pdfUrl: str
+    uploadedBy: str
+    uploadedAt: Optional[str] = None
+
+# What list endpoints send back: counts and the latest few notes instead of
+# every member and every note.
+class ClassSummaryOut(BaseModel):
+    id: str
+    name: str
+    memberCount: int
+    noteCount: int
+    latestNotes: List[NotePreview]
+    isMember: Optional[bool] = None
+
+# A single class: the summary plus its member list.
+class ClassDetailOut(ClassSummaryOut):
+    users: List[str]
+
+# A class in the home feed: the summary plus when it last had a new note.
+class FeedClassOut(ClassSummaryOut):
+    lastActivityAt: Optional[str] = None
+
+# The home feed, most recently active class first. truncated is true when
+# classes were left out to keep the response within its size limits.
+class FeedOut(BaseModel):
+    classes: List[FeedClassOut]
+    truncated: bool
+
 # This is what the data in the database can look like for a class.
+# Its notes ("photos" in the API) live in the notes collection, see note_model.py.
 # {
 #   "_id": "classId123",
 #   "name": "Biology 101",
-#   "users": ["userId1", "userId2"],
-#   "photos": [
-#     {
-#       "imageUrl": "https://cloudinary.com/.../image.jpg",
-#       "pdfUrl": "https://cloudinary.com/.../image.pdf",
-#       "uploadedBy": "userId1",
-#       "uploadedAt": "2026-02-07T18:00:00Z",
-#       "summary": "This chapter explains cell structure..."
-#     }
-#   ]
+#   "users": ["userId1", "userId2"],     # str(users._id), see enrollment_service
+#   "nameNormalized": "biology 101",
+#   "nameTrigrams": ["  1", "  b", " 10", " bi", ...]
 # }
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 class NoteBase(BaseModel):
     imageUrl: str
@@ -16,20 +16,27 @@ class NoteCreate(BaseModel):
 class Note(NoteBase):
     id: str
     uploadedAt: Optional[str] = None
+    # Only set for multi-page lecture PDFs.
+    pageCount: Optional[int] = None
 
-# How notes is stored in the database. 
+# One page of a class's notes, newest first. Pass nextCursor back as `after`
+# to get the following page; it is null on the last page.
+class NotePage(BaseModel):
+    notes: List[Note]
+    nextCursor: Optional[str] = None
+
+# How notes is stored in the database (notes collection, one document per note).
+# Older classes may still embed notes in a "photos" array until
+# backend/migrate_notes.py has been run.
 # {
-#   "_id": "classId",
-#   "photos": [
-#     {
-#       "_id": "noteId",
-#       "imageUrl": "...",
-#       "pdfUrl": "...",
-#       "uploadedBy": "userId",
-#       "uploadedAt": "...",
-#       "summary": "..."
-#     }
-#   ]
+#   "_id": "noteId",
+#   "class_id": "classId",
+#   "imageUrl": "...",
+#   "pdfUrl": "...",
+#   "pageCount": 12,            # lecture PDFs only
+#   "uploadedBy": "userId",
+#   "uploadedAt": "...",
+#   "summary": "..."
 # }
 
 # What APIs should return for notes.
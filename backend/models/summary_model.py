@@ -3,4 +3,13 @@ from typing import List, Optional
 
 class SummaryCreate(BaseModel):
     class_id: str
-    note_id: str
\ No newline at end of file
+    note_id: str
+
+# What the API returns for a summary job, both on submit and when polling.
+class SummaryJobOut(BaseModel):
+    job_id: str
+    status: str
+    summary: Optional[str] = None
+    error: Optional[str] = None
+    createdAt: Optional[str] = None
+    finishedAt: Optional[str] = None
@@ -26,3 +26,13 @@ class UserProfileUpdate(BaseModel):
     name: Optional[str] = None
     phone: Optional[str] = None
 
+
+class UserProfileUpdateOut(UserProfileOut):
+    # Set when the email changed, since tokens for the old one no longer apply.
+    access_token: Optional[str] = None
+    refresh_token: Optional[str] = None
+
+
+class TokenRefresh(BaseModel):
+    refresh_token: str
+
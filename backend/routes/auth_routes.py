@@ -1,10 +1,29 @@
-from fastapi import APIRouter, HTTPException, Query
-from backend.models.user_model import UserCreate, UserLogin, UserProfileOut, UserProfileUpdate
-from backend.services.auth_service import hash_password, verify_password
+from fastapi import APIRouter, Depends, HTTPException
+from pymongo.errors import DuplicateKeyError
+from backend.models.user_model import (
+    TokenRefresh,
+    UserCreate,
+    UserLogin,
+    UserProfileOut,
+    UserProfileUpdate,
+    UserProfileUpdateOut,
+)
+from backend.routes.dependencies import current_user
+from backend.services.auth_service import hash_password_async, verify_password_async
+from backend.services.token_service import REFRESH, InvalidToken, issue_token_pair, verify_token
 from backend.database import users_collection
+from backend.utils.bounded_executor import ExecutorSaturated
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+
+def _auth_busy(e: ExecutorSaturated) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail="Too many sign-in attempts right now, try again shortly",
+        headers={"Retry-After": "1"},
+    )
+
 # POST a user
 @router.post("/signup")
 async def signup(user: UserCreate):
@@ -13,16 +32,25 @@ async def signup(user: UserCreate):
         raise HTTPException(status_code=400, detail="Email already registered")
     print("SIGNUP password bytes:", len(user.password.encode("utf-8")))
     print("SIGNUP password preview:", repr(user.password[:40]))
-    hashed_pw = hash_password(user.password)
+    try:
+        hashed_pw = await hash_password_async(user.password)
+    except ExecutorSaturated as e:
+        raise _auth_busy(e) from e
 
     new_user = {
         "email": user.email,
         "password": hashed_pw,
         "name": getattr(user, "name", None),
         "phone": getattr(user, "phone", None),
+        # Classes this user is in, kept by enrollment_service.
+        "classIds": [],
     }
 
-    await users_collection.insert_one(new_user)
+    try:
+        await users_collection.insert_one(new_user)
+    except DuplicateKeyError as e:
+        # Another signup with the same email won the race.
+        raise HTTPException(status_code=400, detail="Email already registered") from e
 
     return {
         "message": "Signup successful",
@@ -36,24 +64,46 @@ async def signup(user: UserCreate):
 async def login(user: UserLogin):
     db_user = await users_collection.find_one({"email": user.email})
     print("LOGIN ATTEMPT:", user.email, "FOUND:", bool(db_user))
-    db_user = await users_collection.find_one({"email": user.email})
     if not db_user:
         raise HTTPException(status_code=400, detail="Invalid email or password")
 
-    if not verify_password(user.password, db_user["password"]):
+    try:
+        password_ok = await verify_password_async(user.password, db_user["password"])
+    except ExecutorSaturated as e:
+        raise _auth_busy(e) from e
+
+    if not password_ok:
         raise HTTPException(status_code=400, detail="Invalid email or password")
 
     return {
         "message": "Login successful",
         "email": db_user.get("email"),
+        "userId": str(db_user["_id"]),
         "name": db_user.get("name"),
         "phone": db_user.get("phone"),
+        **issue_token_pair(db_user["email"], str(db_user["_id"])),
     }
 
+# POST a refresh token, get a new access/refresh pair.
+# The only token route that reads the database, so deleted users (or ones
+# whose email changed) stop getting new access tokens.
+@router.post("/refresh")
+async def refresh(body: TokenRefresh):
+    try:
+        claims = verify_token(body.refresh_token, REFRESH)
+    except InvalidToken as e:
+        raise HTTPException(status_code=401, detail=str(e)) from e
+
+    db_user = await users_collection.find_one({"email": claims["sub"]}, {"_id": 1, "email": 1})
+    if not db_user or str(db_user["_id"]) != claims["uid"]:
+        raise HTTPException(status_code=401, detail="User no longer exists")
+
+    return issue_token_pair(db_user["email"], str(db_user["_id"]))
+
 
 @router.get("/profile", response_model=UserProfileOut)
-async def get_profile(email: str = Query(...)):
-    db_user = await users_collection.find_one({"email": email})
+async def get_profile(user: dict = Depends(current_user)):
+    db_user = await users_collection.find_one({"email": user["sub"]})
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -64,24 +114,28 @@ async def get_profile(email: str = Query(...)):
     }
 
 
-@router.put("/profile", response_model=UserProfileOut)
+@router.put("/profile", response_model=UserProfileUpdateOut)
 async def update_profile(
     profile: UserProfileUpdate,
-    email: str = Query(...),
+    user: dict = Depends(current_user),
 ):
+    email = user["sub"]
     if profile.email != email:
         existing = await users_collection.find_one({"email": profile.email})
         if existing:
             raise HTTPException(status_code=400, detail="Email already registered")
 
-    result = await users_collection.update_one(
-        {"email": email},
-        {"$set": {
-            "email": profile.email,
-            "name": profile.name,
-            "phone": profile.phone,
-        }},
-    )
+    try:
+        result = await users_collection.update_one(
+            {"email": email},
+            {"$set": {
+                "email": profile.email,
+                "name": profile.name,
+                "phone": profile.phone,
+            }},
+        )
+    except DuplicateKeyError as e:
+        raise HTTPException(status_code=400, detail="Email already registered") from e
 
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
@@ -90,4 +144,5 @@ async def update_profile(
         "email": profile.email,
         "name": profile.name,
         "phone": profile.phone,
+        **(issue_token_pair(profile.email, user["uid"]) if profile.email != email else {}),
     }
\ No newline at end of file
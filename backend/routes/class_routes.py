@@ -1,103 +1,153 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from bson import ObjectId
 from datetime import datetime
 from backend.database import classes_collection
-from backend.models.class_model import ClassCreate, ClassOut
+from backend.models.class_model import ClassCreate, ClassIdsIn, ClassOut, ClassSummaryOut, ClassDetailOut
+from backend.routes.dependencies import current_user
+from backend.services import enrollment_service, note_service
+from backend.services.class_service import CLASS_PREVIEW_LIMIT, find_class_summaries
+from backend.services.search_service import class_search_index, search_class_ids, search_fields
+from backend.utils.fast_json import json_response
+from backend.utils.response_cache import class_tag, response_cache, user_tag
 
 router = APIRouter(prefix="/classes", tags=["classes"])
 
 
-# join a class 
-@router.post("/{class_id}/join")
-async def join_class(class_id: str, user_id: str):
+def _class_object_ids(class_ids: list[str]) -> list[ObjectId]:
     try:
-        class_obj_id = ObjectId(class_id)
+        return [ObjectId(class_id) for class_id in class_ids]
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid class_id")
 
-    # Add user only if not already in the list
-    result = await classes_collection.update_one(
-        {"_id": class_obj_id},
-        {"$addToSet": {"users": user_id}}
-    )
 
-    if result.matched_count == 0:
+# join a class 
+@router.post("/{class_id}/join")
+async def join_class(class_id: str, user: dict = Depends(current_user)):
+    class_obj_id, = _class_object_ids([class_id])
+
+    # Joining a class the user is already in is not an error
+    joined = await enrollment_service.join_classes(user["uid"], [class_obj_id])
+    if not joined:
         raise HTTPException(status_code=404, detail="Class not found")
 
-    # If modified_count == 0, user was already a member (not an error)
     return {"message": "Joined class (or already a member)"} 
 
+# join several classes at once
+# body: {"class_ids": ["...", "..."]}
+@router.post("/join")
+async def join_classes(body: ClassIdsIn, user: dict = Depends(current_user)):
+    class_obj_ids = _class_object_ids(body.class_ids)
+    joined = {str(class_id) for class_id in await enrollment_service.join_classes(user["uid"], class_obj_ids)}
+    return {
+        "joined": [class_id for class_id in body.class_ids if class_id in joined],
+        "notFound": [class_id for class_id in body.class_ids if class_id not in joined],
+    }
+
 # POST a class
 @router.post("", response_model=ClassOut)
 async def create_class(class_data: ClassCreate):
     new_class = {
         "name": class_data.name,
         "users": class_data.users,
-        "photos": class_data.photos,
-        "createdAt": datetime.utcnow().isoformat()
+        "createdAt": datetime.utcnow().isoformat(),
+        **search_fields(class_data.name),
     }
 
     result = await classes_collection.insert_one(new_class)
+    class_search_index.add(result.inserted_id, class_data.name)
+    await enrollment_service.add_members(result.inserted_id, class_data.users)
+    await note_service.insert_notes(
+        result.inserted_id,
+        [{"_id": ObjectId(), **photo.dict()} for photo in class_data.photos],
+    )
 
     return {
         "id": str(result.inserted_id),
         **class_data.dict()
     }
 
-# GET all classes a user is signed up for. 
-@router.get("", response_model=list[ClassOut])
-async def get_user_classes(user_id: str):
-    cursor = classes_collection.find({"users": user_id})
-    classes = []
-
-    async for doc in cursor:
-        classes.append({
-            "id": str(doc["_id"]),
-            "name": doc["name"],
-            "users": doc.get("users", []),
-            "photos": doc.get("photos", [])
-        })
-
-    return classes
-
-# GET class through search (name)
-# /classes?name=Biology
-@router.get("/search", response_model=list[ClassOut])
-async def search_classes_by_name(name: str):
-    cursor = classes_collection.find(
-        {"name": {"$regex": name, "$options": "i"}}
+# GET all classes the signed-in user is signed up for. 
+# (cached, with an ETag; send If-None-Match to get a 304 when unchanged)
+@router.get("", response_model=list[ClassSummaryOut])
+async def get_user_classes(
+    request: Request,
+    user: dict = Depends(current_user),
+    notes_limit: int = Query(CLASS_PREVIEW_LIMIT, ge=1, le=20),
+):
+    user_id = user["uid"]
+
+    async def load():
+        # One read of the user's own class list, then the classes by _id.
+        # Matching users as well drops anything the list still has but the
+        # class no longer agrees with (see enrollment_service).
+        class_ids = await enrollment_service.enrolled_class_ids(user_id)
+        if not class_ids:
+            return []
+        return await find_class_summaries(
+            {"_id": {"$in": class_ids}, "users": user_id},
+            notes_limit,
+        )
+
+    return await response_cache.respond(
+        request,
+        ("user_classes", user_id, notes_limit),
+        load,
+        # Any of these classes changing (new note, member count) changes the list.
+        tags=lambda summaries: [user_tag(user_id), *(class_tag(s["id"]) for s in summaries)],
     )
 
-    results = []
-    async for doc in cursor:
-        results.append({
-            "id": str(doc["_id"]),
-            "name": doc["name"],
-            "users": doc.get("users", []),
-            "photos": doc.get("photos", [])
-        })
-
-    return results
+# GET class through search (name), best matches first
+# /classes/search?name=Biology
+@router.get("/search", response_model=list[ClassSummaryOut])
+async def search_classes_by_name(
+    name: str,
+    user_id: str | None = None,
+    limit: int = Query(20, ge=1, le=50),
+    notes_limit: int = Query(CLASS_PREVIEW_LIMIT, ge=1, le=20),
+):
+    class_ids = await search_class_ids(name, limit)
+    if not class_ids:
+        return json_response([])
+
+    summaries = await find_class_summaries(
+        {"_id": {"$in": class_ids}},
+        notes_limit,
+        user_id=user_id,
+        list_read=True,
+    )
+    rank = {str(class_id): i for i, class_id in enumerate(class_ids)}
+    return json_response(sorted(summaries, key=lambda summary: rank[summary["id"]]))
 
 # GET class through (id)
 # /classes/{class_id}
-@router.get("/{class_id}", response_model=ClassOut)
-async def get_class_by_id(class_id: str):
+# (cached, with an ETag; send If-None-Match to get a 304 when unchanged)
+@router.get("/{class_id}", response_model=ClassDetailOut)
+async def get_class_by_id(
+    request: Request,
+    class_id: str,
+    notes_limit: int = Query(CLASS_PREVIEW_LIMIT, ge=1, le=20),
+):
     try:
         class_obj_id = ObjectId(class_id)
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid class_id")
 
-    doc = await classes_collection.find_one({"_id": class_obj_id})
-    if not doc:
-        raise HTTPException(status_code=404, detail="Class not found")
-
-    return {
-        "id": str(doc["_id"]),
-        "name": doc["name"],
-        "users": doc.get("users", []),
-        "photos": doc.get("photos", [])
-    }
+    async def load():
+        summaries = await find_class_summaries(
+            {"_id": class_obj_id},
+            notes_limit,
+            with_users=True,
+        )
+        if not summaries:
+            raise HTTPException(status_code=404, detail="Class not found")
+        return summaries[0]
+
+    return await response_cache.respond(
+        request,
+        ("class", class_id, notes_limit),
+        load,
+        tags=lambda summary: [class_tag(class_obj_id)],
+    )
 
 # DELETE a class from the db
 @router.delete("/{class_id}")
@@ -107,32 +157,39 @@ async def delete_class(class_id: str):
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid class_id")
 
-    result = await classes_collection.delete_one({"_id": class_obj_id})
-    if result.deleted_count == 0:
+    deleted = await classes_collection.find_one_and_delete({"_id": class_obj_id}, {"users": 1})
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Class not found")
 
+    await enrollment_service.remove_all_members(class_obj_id, deleted.get("users", []))
+    await note_service.delete_class_notes(class_obj_id)
+    class_search_index.remove(class_obj_id)
+    response_cache.invalidate(class_tag(class_obj_id))
+
     return {"message": "Class deleted successfully"}
 
 # POST
 # User drops a class.
 @router.post("/{class_id}/drop")
-async def drop_class(class_id: str, user_id: str):
-    # Validate class_id
-    try:
-        class_obj_id = ObjectId(class_id)
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid class_id")
+async def drop_class(class_id: str, user: dict = Depends(current_user)):
+    class_obj_id, = _class_object_ids([class_id])
 
-    # Remove user from class
-    result = await classes_collection.update_one(
-        {"_id": class_obj_id},
-        {"$pull": {"users": user_id}}
-    )
-
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Class not found")
-
-    if result.modified_count == 0:
+    dropped = await enrollment_service.drop_classes(user["uid"], [class_obj_id])
+    if not dropped:
+        if not await note_service.class_exists(class_obj_id):
+            raise HTTPException(status_code=404, detail="Class not found")
         raise HTTPException(status_code=400, detail="User not enrolled in this class")
 
-    return {"message": "Successfully dropped the class"}
\ No newline at end of file
+    return {"message": "Successfully dropped the class"}
+
+# POST
+# User drops several classes at once.
+# body: {"class_ids": ["...", "..."]}
+@router.post("/drop")
+async def drop_classes(body: ClassIdsIn, user: dict = Depends(current_user)):
+    class_obj_ids = _class_object_ids(body.class_ids)
+    dropped = {str(class_id) for class_id in await enrollment_service.drop_classes(user["uid"], class_obj_ids)}
+    return {
+        "dropped": [class_id for class_id in body.class_ids if class_id in dropped],
+        "notEnrolled": [class_id for class_id in body.class_ids if class_id not in dropped],
+    }
\ No newline at end of file
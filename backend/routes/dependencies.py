@@ -0,0 +1,26 @@
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from backend.services.token_service import ACCESS, InvalidToken, verify_token
+
+_bearer = HTTPBearer(auto_error=False)
+
+
+# Routes that act on "the signed-in user" take `user: dict = Depends(current_user)`
+# and get the access token's claims: {"sub": email, "uid": user _id, ...}.
+# Only the signature and expiry are checked, so there is no database read.
+def current_user(credentials: HTTPAuthorizationCredentials | None = Depends(_bearer)) -> dict:
+    if credentials is None:
+        raise HTTPException(
+            status_code=401,
+            detail="Not signed in",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    try:
+        return verify_token(credentials.credentials, ACCESS)
+    except InvalidToken as e:
+        raise HTTPException(
+            status_code=401,
+            detail=str(e),
+            headers={"WWW-Authenticate": 'Bearer error="invalid_token"'},
+        ) from e
@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends, Query, Request
+from backend.models.class_model import FeedOut
+from backend.routes.dependencies import current_user
+from backend.services.class_service import FEED_PREVIEW_LIMIT, find_feed
+from backend.utils.response_cache import class_tag, response_cache, user_tag
+
+router = APIRouter(prefix="/feed", tags=["feed"])
+
+# GET the signed-in user's home feed: their classes, most recently active
+# first, each with its counts and newest notes. Everything the Home screen
+# needs in one request.
+# (cached, with an ETag; send If-None-Match to get a 304 when unchanged)
+@router.get("", response_model=FeedOut)
+async def get_feed(
+    request: Request,
+    user: dict = Depends(current_user),
+    notes_limit: int = Query(FEED_PREVIEW_LIMIT, ge=1, le=20),
+):
+    user_id = user["uid"]
+    return await response_cache.respond(
+        request,
+        ("feed", user_id, notes_limit),
+        lambda: find_feed(user_id, notes_limit),
+        # Any of these classes changing (new note, member count) changes the feed.
+        tags=lambda feed: [user_tag(user_id), *(class_tag(c["id"]) for c in feed["classes"])],
+    )
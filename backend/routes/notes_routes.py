@@ -1,39 +1,44 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from bson import ObjectId
 from datetime import datetime
-from backend.database import classes_collection
-from backend.models.note_model import Note, NoteCreate
+from backend.models.note_model import Note, NoteCreate, NotePage
+from backend.services import note_service
+from backend.utils.response_cache import class_tag, response_cache
 
 router = APIRouter(prefix="/notes", tags=["notes"])
 
-# GET all notes from a class
-@router.get("", response_model=list[Note])
-async def get_notes(class_id: str = Query(...)):
+# GET notes from a class, newest first, one page at a time
+# (cached, with an ETag; send If-None-Match to get a 304 when unchanged)
+@router.get("", response_model=NotePage)
+async def get_notes(
+    request: Request,
+    class_id: str = Query(...),
+    limit: int = Query(20, ge=1, le=100),
+    after: str | None = None,
+):
     try:
         class_obj_id = ObjectId(class_id)
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid class_id")
 
-    doc = await classes_collection.find_one(
-        {"_id": class_obj_id},
-        {"photos": 1}
-    )
+    async def load():
+        try:
+            page = await note_service.find_notes_page(class_obj_id, limit, after)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
 
-    if not doc:
-        raise HTTPException(status_code=404, detail="Class not found")
+        if page is None:
+            raise HTTPException(status_code=404, detail="Class not found")
 
-    notes = []
-    for note in doc.get("photos", []):
-        notes.append({
-            "id": str(note["_id"]),
-            "imageUrl": note["imageUrl"],
-            "pdfUrl": note["pdfUrl"],
-            "uploadedBy": note["uploadedBy"],
-            "uploadedAt": note.get("uploadedAt"),
-            "summary": note.get("summary")
-        })
+        notes, next_cursor = page
+        return {"notes": notes, "nextCursor": next_cursor}
 
-    return notes
+    return await response_cache.respond(
+        request,
+        ("notes", class_id, limit, after),
+        load,
+        tags=lambda page: [class_tag(class_obj_id)],
+    )
 
 # POST a note to a class
 @router.post("", response_model=Note)
@@ -46,6 +51,9 @@ async def create_note(
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid class_id")
 
+    if not await note_service.class_exists(class_obj_id):
+        raise HTTPException(status_code=404, detail="Class not found")
+
     note_id = ObjectId()
     note_doc = {
         "_id": note_id,
@@ -56,19 +64,9 @@ async def create_note(
         "summary": note.summary
     }
 
-    result = await classes_collection.update_one(
-        {"_id": class_obj_id},
-        {"$push": {"photos": note_doc}}
-    )
-
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Class not found")
+    await note_service.insert_note(class_obj_id, note_doc)
 
-    return {
-        "id": str(note_id),
-        **note_doc,
-        "_id": None
-    }
+    return note_service.note_to_out(note_doc)
 
 # GET a single note
 @router.get("/{note_id}", response_model=Note)
@@ -82,24 +80,12 @@ async def get_note(
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid ID")
 
-    doc = await classes_collection.find_one(
-        {"_id": class_obj_id, "photos._id": note_obj_id},
-        {"photos.$": 1}
-    )
+    note = await note_service.find_note(class_obj_id, note_obj_id)
 
-    if not doc or "photos" not in doc:
+    if not note:
         raise HTTPException(status_code=404, detail="Note not found")
 
-    note = doc["photos"][0]
-
-    return {
-        "id": str(note["_id"]),
-        "imageUrl": note["imageUrl"],
-        "pdfUrl": note["pdfUrl"],
-        "uploadedBy": note["uploadedBy"],
-        "uploadedAt": note.get("uploadedAt"),
-        "summary": note.get("summary")
-    }
+    return note_service.note_to_out(note)
 
 # DELETE a note from a class
 @router.delete("/{note_id}")
@@ -113,15 +99,9 @@ async def delete_note(
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid ID")
 
-    result = await classes_collection.update_one(
-        {"_id": class_obj_id},
-        {"$pull": {"photos": {"_id": note_obj_id}}}
-    )
-
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Class not found")
-
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="Note not found")
+    try:
+        await note_service.delete_note(class_obj_id, note_obj_id)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
 
-    return {"message": "Note deleted successfully"}
\ No newline at end of file
+    return {"message": "Note deleted successfully"}
@@ -1,13 +1,13 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
-from pydantic import BaseModel
-from backend.services.summarize_service import summarize_pdf_with_gemini_vision
+from backend.models.summary_model import SummaryJobOut
+from backend.services.summarize_service import summarizer
+from backend.services.summary_cache_service import summary_cache
+from backend.services.summary_job_service import summary_job_queue
 
 router = APIRouter(prefix="/summaries", tags=["summaries"])
 
-class SummaryResponse(BaseModel):
-    summary: str
-
-@router.post("", response_model=SummaryResponse)
+# POST a PDF to summarize. Returns a job right away; poll it with the GET below.
+@router.post("", response_model=SummaryJobOut, status_code=202)
 async def generate_summary(file: UploadFile = File(...)):
     if file.content_type != "application/pdf":
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
@@ -16,5 +16,27 @@ async def generate_summary(file: UploadFile = File(...)):
     if not file_bytes:
         raise HTTPException(status_code=400, detail="Empty file")
 
-    summary_text = summarize_pdf_with_gemini_vision(file_bytes)
-    return {"summary": summary_text}
+    return await summary_job_queue.submit(file_bytes)
+
+# GET summary cache hit/miss counters
+@router.get("/cache-stats")
+async def get_summary_cache_stats():
+    return summary_cache.stats()
+
+# GET rate limiter, retry and circuit breaker state of the model backend
+@router.get("/summarizer-stats")
+async def get_summarizer_stats():
+    return {"backend": summarizer.name, **summarizer.stats()}
+
+# GET the status (and summary, once done) of a job
+@router.get("/{job_id}", response_model=SummaryJobOut)
+async def get_summary_job(job_id: str):
+    try:
+        job = await summary_job_queue.get(job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Summary job not found")
+
+    return job
@@ -1,26 +1,60 @@
 import json
+from typing import List
 
 from fastapi import APIRouter, UploadFile, File, HTTPException, Form
 
 from backend.services.upload_service import (
     upload_image_and_convert_to_pdf,
     upload_image_and_save_note,
+    upload_images_and_save_notes,
+    upload_lecture_and_save_note,
+    upload_metrics,
 )
+from backend.utils.bounded_executor import ExecutorSaturated
 
 router = APIRouter()
 
+
+def _upload_busy(e: ExecutorSaturated) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail=str(e),
+        headers={"Retry-After": "1"},
+    )
+
+
+def _parse_metadata(metadata: str) -> tuple[str, str, str | None, str | None]:
+    """class_id, uploaded_by, summary and title from an upload's metadata form field."""
+    try:
+        data = json.loads(metadata)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail="Invalid metadata JSON") from e
+    if not isinstance(data, dict):
+        raise HTTPException(status_code=400, detail="Invalid metadata JSON")
+
+    class_id = data.get("class_id")
+    uploaded_by = data.get("uploaded_by")
+
+    if not class_id or not uploaded_by:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing class_id or uploaded_by in metadata",
+        )
+    return class_id, uploaded_by, data.get("summary"), data.get("title")
+
+
 @router.post("/upload-to-pdf")
 async def upload_to_pdf(file: UploadFile = File(...)):
     try:
-        file_bytes = await file.read()
-        if not file_bytes:
-            raise HTTPException(status_code=400, detail="Empty file upload.")
-
-        result = upload_image_and_convert_to_pdf(file_bytes)
+        # file.file is already spooled to disk by the form parser; it is
+        # streamed to storage rather than read into memory here.
+        result = await upload_image_and_convert_to_pdf(file.file, file.filename)
         return result
 
     except HTTPException:
         raise
+    except ExecutorSaturated as e:
+        raise _upload_busy(e) from e
     except Exception as e:
         # Return readable backend error to frontend
         raise HTTPException(status_code=400, detail=str(e))
@@ -32,38 +66,88 @@ async def upload_to_pdf_and_save(
     metadata: str = Form(...),
 ):
     try:
-        try:
-            data = json.loads(metadata)
-        except Exception as e:
-            raise HTTPException(status_code=400, detail="Invalid metadata JSON") from e
+        class_id, uploaded_by, summary, _ = _parse_metadata(metadata)
 
-        class_id = data.get("class_id")
-        uploaded_by = data.get("uploaded_by")
-        summary = data.get("summary")
+        return await upload_image_and_save_note(
+            file=file.file,
+            class_id=class_id,
+            uploaded_by=uploaded_by,
+            summary=summary,
+            filename=file.filename,
+        )
 
-        if not class_id or not uploaded_by:
-            raise HTTPException(
-                status_code=400,
-                detail="Missing class_id or uploaded_by in metadata",
-            )
+    except HTTPException:
+        raise
+    except ExecutorSaturated as e:
+        raise _upload_busy(e) from e
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    except Exception as e:
+        # Return readable backend error to frontend
+        raise HTTPException(status_code=400, detail=str(e))
 
-        file_bytes = await file.read()
-        if not file_bytes:
-            raise HTTPException(status_code=400, detail="Empty file upload.")
 
-        return await upload_image_and_save_note(
-            file_bytes=file_bytes,
+@router.post("/upload-to-pdf-and-save-batch")
+async def upload_to_pdf_and_save_batch(
+    files: List[UploadFile] = File(...),
+    metadata: str = Form(...),
+):
+    # Each file becomes its own note. Check "results" for files that failed;
+    # the others are saved regardless.
+    try:
+        class_id, uploaded_by, summary, _ = _parse_metadata(metadata)
+
+        return await upload_images_and_save_notes(
+            files=[(file.file, file.filename) for file in files],
+            class_id=class_id,
+            uploaded_by=uploaded_by,
+            summary=summary,
+        )
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    except Exception as e:
+        # Return readable backend error to frontend
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/upload-lecture")
+async def upload_lecture(
+    files: List[UploadFile] = File(...),
+    metadata: str = Form(...),
+):
+    # Photos are pages in the order they were sent; they are saved as one
+    # multi-page PDF note.
+    try:
+        class_id, uploaded_by, summary, title = _parse_metadata(metadata)
+
+        return await upload_lecture_and_save_note(
+            files=[file.file for file in files],
             class_id=class_id,
             uploaded_by=uploaded_by,
             summary=summary,
+            filename=title or files[0].filename,
         )
 
     except HTTPException:
         raise
+    except ExecutorSaturated as e:
+        raise _upload_busy(e) from e
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
     except LookupError as e:
         raise HTTPException(status_code=404, detail=str(e)) from e
     except Exception as e:
         # Return readable backend error to frontend
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/upload-metrics")
+async def get_upload_metrics():
+    return upload_metrics()
@@ -1,12 +1,14 @@
 import asyncio
 from datetime import datetime
-from database import users_collection, classes_collection
-from services.auth_service import hash_password
+from bson import ObjectId
+from backend.database import users_collection, classes_collection, notes_collection
+from backend.services.auth_service import hash_password
 
 async def seed_db():
     # 🔥 Clear existing data (DEV ONLY)
     await users_collection.delete_many({})
     await classes_collection.delete_many({})
+    await notes_collection.delete_many({})
 
     # --------------------
     # Users
@@ -38,6 +40,8 @@ async def seed_db():
         }
     ]
     await users_collection.insert_many(users)
+    # Memberships are keyed by user id (see enrollment_service).
+    user_ids = {user["email"]: str(user["_id"]) for user in users}
 
     # --------------------
     # Classes + Notes
@@ -103,11 +107,27 @@ async def seed_db():
         }
     ]
 
-    await classes_collection.insert_many(classes)
+    # Notes are stored in their own collection, pointing back at their class.
+    photos_by_class = [class_doc.pop("photos") for class_doc in classes]
+    for class_doc in classes:
+        class_doc["users"] = [user_ids[email] for email in class_doc["users"]]
+    result = await classes_collection.insert_many(classes)
+    for class_id, class_doc in zip(result.inserted_ids, classes):
+        await users_collection.update_many(
+            {"_id": {"$in": [ObjectId(user_id) for user_id in class_doc["users"]]}},
+            {"$addToSet": {"classIds": class_id}},
+        )
+
+    notes = []
+    for class_id, photos in zip(result.inserted_ids, photos_by_class):
+        for photo in photos:
+            notes.append({**photo, "class_id": class_id})
+    await notes_collection.insert_many(notes)
 
     print("✅ Database seeded successfully")
     print(f"👤 Users: {len(users)}")
     print(f"🏫 Classes: {len(classes)}")
+    print(f"📝 Notes: {len(notes)}")
 
 if __name__ == "__main__":
     asyncio.run(seed_db())
\ No newline at end of file
@@ -1,5 +1,10 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 from passlib.context import CryptContext
 
+from backend.utils.bounded_executor import BoundedExecutor
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def hash_password(password: str) -> str:
@@ -12,3 +17,25 @@ def hash_password(password: str) -> str:
 
 def verify_password(plain: str, hashed: str):
     return pwd_context.verify(plain, hashed)
+
+
+# bcrypt is pure CPU, so the async variants below run it in a process pool
+# sized to the machine. PASSWORD_MAX_QUEUE caps how many more hashes may wait
+# for a free process; past that the routes fail fast with a 429.
+PASSWORD_MAX_WORKERS = int(os.getenv("PASSWORD_MAX_WORKERS", str(os.cpu_count() or 1)))
+PASSWORD_MAX_QUEUE = int(os.getenv("PASSWORD_MAX_QUEUE", str(PASSWORD_MAX_WORKERS * 4)))
+
+password_executor = BoundedExecutor(
+    name="bcrypt",
+    max_workers=PASSWORD_MAX_WORKERS,
+    max_queue=PASSWORD_MAX_QUEUE,
+    executor_factory=lambda n: ProcessPoolExecutor(max_workers=n),
+)
+
+
+async def hash_password_async(password: str) -> str:
+    return await password_executor.run(hash_password, password)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    return await password_executor.run(verify_password, plain, hashed)
@@ -0,0 +1,187 @@
+import os
+
+from bson import ObjectId
+
+from backend.database import classes_collection, classes_list_collection, notes_collection, users_collection
+from backend.utils.fast_json import dumps
+
+# How many of the newest notes each class listing includes by default.
+CLASS_PREVIEW_LIMIT = int(os.getenv("CLASS_PREVIEW_LIMIT", "3"))
+
+# The home feed (GET /api/feed): previews per class by default, and caps on
+# how many classes and how many bytes of JSON one response may hold.
+FEED_PREVIEW_LIMIT = int(os.getenv("FEED_PREVIEW_LIMIT", "5"))
+FEED_MAX_CLASSES = int(os.getenv("FEED_MAX_CLASSES", "50"))
+FEED_MAX_BYTES = int(os.getenv("FEED_MAX_BYTES", str(256 * 1024)))
+
+_PREVIEW_FIELDS = ("imageUrl", "pdfUrl", "uploadedBy", "uploadedAt")
+
+
+def _previews(notes) -> dict:
+    # Notes in the API's NotePreview shape: "id" as a string, missing fields as null.
+    return {"$map": {
+        "input": notes,
+        "as": "n",
+        "in": {
+            "id": {"$toString": "$$n._id"},
+            **{field: {"$ifNull": [f"$$n.{field}", None]} for field in _PREVIEW_FIELDS},
+        },
+    }}
+
+
+def class_summary_pipeline(
+    match: dict,
+    preview_limit: int,
+    user_id: str | None = None,
+    with_users: bool = False,
+    with_activity: bool = False,
+) -> list:
+    """
+    Aggregation returning one compact document per class, already in the
+    ClassSummaryOut shape: counts plus the newest notes, without ever loading
+    the member list or the notes' bodies. Uses $lookup with localField and a
+    sub-pipeline (MongoDB 5.0+), which is served by the notes
+    (class_id, uploadedAt, _id) index. with_activity adds lastActivityAt:
+    the newest note's upload time, or the class's creation if it has none.
+    """
+    project = {
+        "name": 1,
+        "memberCount": {"$size": {"$ifNull": ["$users", []]}},
+        "legacyNoteCount": {"$size": {"$ifNull": ["$photos", []]}},
+        # Newest embedded photos (not yet migrated).
+        "legacyNotes": {"$slice": [{"$ifNull": ["$photos", []]}, -preview_limit]},
+    }
+    if user_id is not None:
+        project["isMember"] = {"$in": [user_id, {"$ifNull": ["$users", []]}]}
+    if with_users:
+        project["users"] = 1
+    if with_activity:
+        project["createdAt"] = 1
+
+    shape = {
+        "_id": 0,
+        "id": {"$toString": "$_id"},
+        "name": 1,
+        "memberCount": 1,
+        "noteCount": {"$add": [
+            {"$ifNull": [{"$arrayElemAt": ["$noteCount.n", 0]}, 0]},
+            "$legacyNoteCount",
+        ]},
+        "latestNotes": _previews("$latestNotes"),
+        "legacyNotes": _previews("$legacyNotes"),
+        "isMember": 1 if user_id is not None else {"$literal": None},
+    }
+    if with_users:
+        shape["users"] = 1
+    if with_activity:
+        # ISO timestamps, so the greatest string is the latest time.
+        shape["lastActivityAt"] = {"$max": [
+            {"$max": "$latestNotes.uploadedAt"},
+            {"$max": "$legacyNotes.uploadedAt"},
+            "$createdAt",
+        ]}
+
+    latest = [
+        {"$sort": {"uploadedAt": -1, "_id": -1}},
+        {"$limit": preview_limit},
+        {"$project": {field: 1 for field in _PREVIEW_FIELDS}},
+    ]
+
+    return [
+        {"$match": match},
+        {"$project": project},
+        {"$lookup": {
+            "from": notes_collection.name,
+            "localField": "_id",
+            "foreignField": "class_id",
+            "pipeline": latest,
+            "as": "latestNotes",
+        }},
+        {"$lookup": {
+            "from": notes_collection.name,
+            "localField": "_id",
+            "foreignField": "class_id",
+            "pipeline": [{"$count": "n"}],
+            "as": "noteCount",
+        }},
+        {"$project": shape},
+    ]
+
+
+def summary_to_out(doc: dict, preview_limit: int) -> dict:
+    # Only classes that still embed photos need their previews merged here.
+    legacy = doc.pop("legacyNotes", None)
+    if legacy:
+        notes = doc["latestNotes"] + legacy
+        notes.sort(key=lambda n: (n["uploadedAt"] or "", n["id"]), reverse=True)
+        doc["latestNotes"] = notes[:preview_limit]
+    return doc
+
+
+async def find_class_summaries(
+    match: dict,
+    preview_limit: int = CLASS_PREVIEW_LIMIT,
+    user_id: str | None = None,
+    with_users: bool = False,
+    list_read: bool = False,
+) -> list[dict]:
+    """
+    list_read=True follows MONGO_LIST_READ_PREFERENCE (see database), which
+    may be a secondary; only for results that are not cached.
+    """
+    pipeline = class_summary_pipeline(match, preview_limit, user_id, with_users)
+    collection = classes_list_collection if list_read else classes_collection
+    docs = await collection.aggregate(pipeline).to_list(None)
+    return [summary_to_out(doc, preview_limit) for doc in docs]
+
+
+def feed_pipeline(user_id: str, preview_limit: int, max_classes: int) -> list:
+    """
+    The home feed as one aggregation, starting from the user's own document:
+    their classes (see enrollment_service) as summaries, most recently active
+    first. Returns a single {"classes": [...]} document.
+    """
+    classes = class_summary_pipeline({"users": user_id}, preview_limit, user_id, with_activity=True)
+    return [
+        {"$match": {"_id": ObjectId(user_id)}},
+        {"$lookup": {
+            "from": classes_collection.name,
+            "localField": "classIds",
+            "foreignField": "_id",
+            "pipeline": classes + [
+                {"$sort": {"lastActivityAt": -1, "id": 1}},
+                {"$limit": max_classes},
+            ],
+            "as": "classes",
+        }},
+        {"$project": {"_id": 0, "classes": 1}},
+    ]
+
+
+def _within_bytes(summaries: list[dict], max_bytes: int) -> list[dict]:
+    # Whole classes only, in order, while their JSON fits in max_bytes.
+    kept = []
+    used = 0
+    for summary in summaries:
+        used += len(dumps(summary)) + 1
+        if used > max_bytes:
+            break
+        kept.append(summary)
+    return kept
+
+
+async def find_feed(
+    user_id: str,
+    preview_limit: int = FEED_PREVIEW_LIMIT,
+    max_classes: int = FEED_MAX_CLASSES,
+    max_bytes: int = FEED_MAX_BYTES,
+) -> dict:
+    """
+    {"classes": [...], "truncated": bool}; truncated is set when classes were
+    left out to stay within max_classes or max_bytes.
+    """
+    # One more than the cap tells us whether any were left out.
+    docs = await users_collection.aggregate(feed_pipeline(user_id, preview_limit, max_classes + 1)).to_list(None)
+    summaries = [summary_to_out(doc, preview_limit) for doc in (docs[0]["classes"] if docs else [])]
+    kept = _within_bytes(summaries[:max_classes], max_bytes)
+    return {"classes": kept, "truncated": len(kept) < len(summaries)}
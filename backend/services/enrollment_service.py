@@ -0,0 +1,92 @@
+from bson import ObjectId
+from bson.errors import InvalidId
+
+from backend.database import classes_collection, users_collection
+from backend.utils.response_cache import class_tag, response_cache, user_tag
+
+# Enrollment is keyed by the user's stable id (str of users._id), never the
+# email, so changing an email keeps every membership. It is stored twice:
+#
+#   classes.users     member ids of a class (member counts, isMember, and the
+#                     source of truth when the two sides disagree)
+#   users.classIds    the classes a user is in, so "my classes" starts from a
+#                     single read of the user's document by _id
+#
+# Writes update classes first and the user's list second. If the second write
+# is lost, reads filter the list against classes.users, and re-running
+# backend/migrate_enrollments.py --restart repairs it.
+
+
+def user_object_ids(user_ids) -> list[ObjectId]:
+    # Skips anything that isn't an id (e.g. emails not migrated yet).
+    oids = []
+    for user_id in user_ids:
+        try:
+            oids.append(ObjectId(user_id))
+        except (InvalidId, TypeError):
+            continue
+    return oids
+
+
+async def enrolled_class_ids(user_id: str) -> list[ObjectId]:
+    user = await users_collection.find_one({"_id": ObjectId(user_id)}, {"classIds": 1})
+    return user.get("classIds", []) if user else []
+
+
+async def join_classes(user_id: str, class_ids: list[ObjectId]) -> list[ObjectId]:
+    """Enrolls the user in each of `class_ids` that exists and returns those (already enrolled included)."""
+    existing = [doc["_id"] async for doc in classes_collection.find({"_id": {"$in": class_ids}}, {"_id": 1})]
+    if not existing:
+        return []
+
+    await classes_collection.update_many(
+        {"_id": {"$in": existing}},
+        {"$addToSet": {"users": user_id}},
+    )
+    await users_collection.update_one(
+        {"_id": ObjectId(user_id)},
+        {"$addToSet": {"classIds": {"$each": existing}}},
+    )
+    response_cache.invalidate(user_tag(user_id), *(class_tag(class_id) for class_id in existing))
+    return existing
+
+
+async def drop_classes(user_id: str, class_ids: list[ObjectId]) -> list[ObjectId]:
+    """Removes the user from each of `class_ids` and returns the ones they were actually enrolled in."""
+    enrolled = [
+        doc["_id"]
+        async for doc in classes_collection.find({"_id": {"$in": class_ids}, "users": user_id}, {"_id": 1})
+    ]
+    if not enrolled:
+        return []
+
+    await classes_collection.update_many(
+        {"_id": {"$in": enrolled}},
+        {"$pull": {"users": user_id}},
+    )
+    await users_collection.update_one(
+        {"_id": ObjectId(user_id)},
+        {"$pull": {"classIds": {"$in": enrolled}}},
+    )
+    response_cache.invalidate(user_tag(user_id), *(class_tag(class_id) for class_id in enrolled))
+    return enrolled
+
+
+async def add_members(class_obj_id: ObjectId, user_ids: list[str]) -> None:
+    """The user side of a new class's member list (classes.users is written with the class)."""
+    if user_ids:
+        await users_collection.update_many(
+            {"_id": {"$in": user_object_ids(user_ids)}},
+            {"$addToSet": {"classIds": class_obj_id}},
+        )
+        response_cache.invalidate(*(user_tag(user_id) for user_id in user_ids))
+
+
+async def remove_all_members(class_obj_id: ObjectId, user_ids: list[str]) -> None:
+    """Takes a deleted class off its members' lists."""
+    if user_ids:
+        await users_collection.update_many(
+            {"_id": {"$in": user_object_ids(user_ids)}},
+            {"$pull": {"classIds": class_obj_id}},
+        )
+        response_cache.invalidate(*(user_tag(user_id) for user_id in user_ids))
@@ -0,0 +1,90 @@
+import io
+import os
+from typing import BinaryIO
+
+from backend.utils.bounded_executor import BoundedExecutor
+
+# Phone photos are shrunk and recompressed before they are stored.
+# IMAGE_MODE: "color" keeps colour, "grayscale" drops it, "contrast" also
+# stretches the levels, which suits photos of paper notes.
+IMAGE_PREPROCESS = os.getenv("IMAGE_PREPROCESS", "1").lower() not in ("0", "false", "no")
+IMAGE_MAX_DIMENSION = int(os.getenv("IMAGE_MAX_DIMENSION", "2000"))
+IMAGE_MODE = os.getenv("IMAGE_MODE", "contrast")
+IMAGE_JPEG_QUALITY = int(os.getenv("IMAGE_JPEG_QUALITY", "80"))
+
+# Pillow releases the GIL while decoding, resizing and encoding, so a thread
+# pool is enough to use several cores without copying images between processes.
+IMAGE_MAX_WORKERS = int(os.getenv("IMAGE_MAX_WORKERS", str(os.cpu_count() or 1)))
+IMAGE_MAX_QUEUE = int(os.getenv("IMAGE_MAX_QUEUE", "16"))
+
+image_executor = BoundedExecutor(
+    name="image-preprocess",
+    max_workers=IMAGE_MAX_WORKERS,
+    max_queue=IMAGE_MAX_QUEUE,
+)
+
+_totals = {"images": 0, "bytes_in": 0, "bytes_out": 0}
+
+
+def _preprocess(file: BinaryIO) -> tuple[io.BytesIO, dict]:
+    # Pillow is imported on first use to keep API startup fast.
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    file.seek(0, os.SEEK_END)
+    bytes_in = file.tell()
+    file.seek(0)
+
+    try:
+        image = Image.open(file)
+        original_size = image.size
+        # For JPEGs, let the decoder skip detail we are about to throw away.
+        image.draft("RGB", (IMAGE_MAX_DIMENSION, IMAGE_MAX_DIMENSION))
+        image = ImageOps.exif_transpose(image)
+    except (UnidentifiedImageError, OSError) as e:
+        raise ValueError("Unsupported image file.") from e
+
+    image.thumbnail((IMAGE_MAX_DIMENSION, IMAGE_MAX_DIMENSION), Image.LANCZOS)
+
+    if IMAGE_MODE in ("grayscale", "contrast"):
+        image = image.convert("L")
+        if IMAGE_MODE == "contrast":
+            image = ImageOps.autocontrast(image, cutoff=1)
+    else:
+        image = image.convert("RGB")
+
+    out = io.BytesIO()
+    image.save(out, format="JPEG", quality=IMAGE_JPEG_QUALITY, optimize=True, progressive=True)
+    out.seek(0)
+
+    return out, {
+        "bytesBefore": bytes_in,
+        "bytesAfter": out.getbuffer().nbytes,
+        "sizeBefore": list(original_size),
+        "sizeAfter": list(image.size),
+    }
+
+
+async def preprocess_image(file: BinaryIO) -> tuple[BinaryIO, dict | None]:
+    """
+    Returns the file to store and before/after stats (None when preprocessing
+    is turned off). Raises ValueError for files Pillow can't read and
+    ExecutorSaturated when the pool is full.
+    """
+    if not IMAGE_PREPROCESS:
+        return file, None
+
+    out, stats = await image_executor.run(_preprocess, file)
+    _totals["images"] += 1
+    _totals["bytes_in"] += stats["bytesBefore"]
+    _totals["bytes_out"] += stats["bytesAfter"]
+    return out, stats
+
+
+def image_metrics() -> dict:
+    saved = _totals["bytes_in"] - _totals["bytes_out"]
+    return {
+        **image_executor.metrics(),
+        **_totals,
+        "bytes_saved": saved,
+        "ratio": round(_totals["bytes_out"] / _totals["bytes_in"], 3) if _totals["bytes_in"] else None,
+    }
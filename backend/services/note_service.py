@@ -0,0 +1,196 @@
+import base64
+import json
+
+from bson import ObjectId
+
+from backend.database import classes_collection, notes_collection
+from backend.utils.response_cache import class_tag, response_cache
+
+# Notes live in their own collection, one document per note, instead of the
+# old "photos" array on each class. Classes that have not been migrated yet
+# (see backend/migrate_notes.py) may still carry embedded photos, so reads
+# merge both places until the migration has run everywhere.
+
+# Every write here invalidates the class's cached reads (see response_cache).
+
+# Pages are newest first. The (class_id, uploadedAt, _id) index serves this
+# sort by walking backwards, and (uploadedAt, _id) is unique so pages never
+# skip or repeat a note.
+NOTE_PAGE_SORT = [("uploadedAt", -1), ("_id", -1)]
+
+# A note in the API's shape (see note_to_out), built by the query itself so
+# pages go to the client without another pass in Python. _id is kept for
+# paging and removed before the page is returned.
+NOTE_OUT_PROJECTION = {
+    "id": {"$toString": "$_id"},
+    "imageUrl": 1,
+    "pdfUrl": 1,
+    "pageCount": {"$ifNull": ["$pageCount", None]},
+    "uploadedBy": 1,
+    "uploadedAt": {"$ifNull": ["$uploadedAt", None]},
+    "summary": {"$ifNull": ["$summary", None]},
+}
+
+
+def note_to_out(note: dict) -> dict:
+    return {
+        "id": str(note["_id"]),
+        "imageUrl": note["imageUrl"],
+        "pdfUrl": note["pdfUrl"],
+        "pageCount": note.get("pageCount"),
+        "uploadedBy": note["uploadedBy"],
+        "uploadedAt": note.get("uploadedAt"),
+        "summary": note.get("summary"),
+    }
+
+
+def _sort_key(note: dict):
+    return (note.get("uploadedAt") or "", str(note["_id"]))
+
+
+def encode_cursor(note: dict) -> str:
+    note_id = note["_id"]
+    raw = json.dumps({
+        "t": note.get("uploadedAt"),
+        "id": str(note_id),
+        "oid": isinstance(note_id, ObjectId),
+    })
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[str | None, ObjectId | str]:
+    """Raises ValueError for anything that isn't a cursor we handed out."""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        uploaded_at, note_id = data["t"], data["id"]
+        # Both end up in the query, so only the plain values we wrote get through.
+        if not (uploaded_at is None or isinstance(uploaded_at, str)) or not isinstance(note_id, str):
+            raise ValueError("Invalid cursor")
+        return uploaded_at, ObjectId(note_id) if data["oid"] else note_id
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def _before(cursor: tuple[str | None, ObjectId | str]) -> dict:
+    uploaded_at, note_id = cursor
+    return {"$or": [
+        {"uploadedAt": {"$lt": uploaded_at}},
+        {"uploadedAt": uploaded_at, "_id": {"$lt": note_id}},
+    ]}
+
+
+async def class_exists(class_obj_id: ObjectId) -> bool:
+    return await classes_collection.find_one({"_id": class_obj_id}, {"_id": 1}) is not None
+
+
+async def insert_note(class_obj_id: ObjectId, note_doc: dict) -> None:
+    await notes_collection.insert_one({**note_doc, "class_id": class_obj_id})
+    response_cache.invalidate(class_tag(class_obj_id))
+
+
+async def insert_notes(class_obj_id: ObjectId, note_docs: list[dict]) -> None:
+    if note_docs:
+        await notes_collection.insert_many(
+            [{**note_doc, "class_id": class_obj_id} for note_doc in note_docs]
+        )
+        response_cache.invalidate(class_tag(class_obj_id))
+
+
+async def _legacy_page(class_obj_id: ObjectId, after, limit: int) -> list[dict]:
+    # Same page over photos still embedded in the class document.
+    pipeline = [
+        {"$match": {"_id": class_obj_id}},
+        {"$unwind": "$photos"},
+        {"$replaceRoot": {"newRoot": "$photos"}},
+    ]
+    if after:
+        pipeline.append({"$match": _before(after)})
+    pipeline += [
+        {"$sort": dict(NOTE_PAGE_SORT)},
+        {"$limit": limit},
+        {"$project": NOTE_OUT_PROJECTION},
+    ]
+    return await classes_collection.aggregate(pipeline).to_list(None)
+
+
+async def find_notes_page(
+    class_obj_id: ObjectId,
+    limit: int,
+    after: str | None = None,
+) -> tuple[list[dict], str | None] | None:
+    """
+    One page of a class's notes, newest first and already in the API's shape,
+    plus the cursor for the next page (None on the last page). Returns None
+    if the class does not exist. Raises ValueError for a bad cursor.
+    """
+    position = decode_cursor(after) if after else None
+
+    class_doc = await classes_collection.find_one(
+        {"_id": class_obj_id},
+        {"photos": {"$slice": 1}}
+    )
+    if not class_doc:
+        return None
+
+    query = {"class_id": class_obj_id}
+    if position:
+        query.update(_before(position))
+    # One extra row tells us whether another page exists.
+    # Primary, like class_doc: pages are cached (see database).
+    notes = await notes_collection.aggregate([
+        {"$match": query},
+        {"$sort": dict(NOTE_PAGE_SORT)},
+        {"$limit": limit + 1},
+        {"$project": NOTE_OUT_PROJECTION},
+    ]).to_list(None)
+
+    if class_doc.get("photos"):
+        # A photo can briefly exist in both places while the migration copies it.
+        seen = {note["_id"] for note in notes}
+        legacy = await _legacy_page(class_obj_id, position, limit + 1)
+        notes += [photo for photo in legacy if photo.get("_id") not in seen]
+        notes.sort(key=_sort_key, reverse=True)
+
+    page = notes[:limit]
+    next_cursor = encode_cursor(page[-1]) if len(notes) > limit else None
+    for note in page:
+        del note["_id"]
+    return page, next_cursor
+
+
+async def find_note(class_obj_id: ObjectId, note_obj_id: ObjectId) -> dict | None:
+    note = await notes_collection.find_one({"_id": note_obj_id, "class_id": class_obj_id})
+    if note:
+        return note
+
+    doc = await classes_collection.find_one(
+        {"_id": class_obj_id, "photos._id": note_obj_id},
+        {"photos.$": 1}
+    )
+    if not doc or "photos" not in doc:
+        return None
+    return doc["photos"][0]
+
+
+async def delete_note(class_obj_id: ObjectId, note_obj_id: ObjectId) -> None:
+    """Raises LookupError if either the class or the note is missing."""
+    result = await notes_collection.delete_one({"_id": note_obj_id, "class_id": class_obj_id})
+    if result.deleted_count:
+        response_cache.invalidate(class_tag(class_obj_id))
+        return
+
+    result = await classes_collection.update_one(
+        {"_id": class_obj_id},
+        {"$pull": {"photos": {"_id": note_obj_id}}}
+    )
+    if result.modified_count:
+        response_cache.invalidate(class_tag(class_obj_id))
+    if result.matched_count == 0:
+        raise LookupError("Class not found")
+    if result.modified_count == 0:
+        raise LookupError("Note not found")
+
+
+async def delete_class_notes(class_obj_id: ObjectId) -> None:
+    await notes_collection.delete_many({"class_id": class_obj_id})
+    response_cache.invalidate(class_tag(class_obj_id))
@@ -0,0 +1,210 @@
+import asyncio
+import bisect
+import os
+import re
+import unicodedata
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from backend.database import classes_collection
+
+# Minimum share of the query's trigrams a class name must contain to count
+# as a fuzzy match.
+SEARCH_MIN_SIMILARITY = float(os.getenv("SEARCH_MIN_SIMILARITY", "0.3"))
+# Autocomplete entries are rebuilt from Mongo this often, in the background,
+# so classes created or deleted by other API processes show up too.
+SEARCH_REFRESH_SECONDS = int(os.getenv("SEARCH_REFRESH_SECONDS", "60"))
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_name(name: str) -> str:
+    # "CS 201 – Data Structures" -> "cs 201 data structures"
+    text = unicodedata.normalize("NFKD", name)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return _NON_ALNUM.sub(" ", text.lower()).strip()
+
+
+def trigrams(normalized: str) -> list[str]:
+    grams = set()
+    for word in normalized.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return sorted(grams)
+
+
+def search_fields(name: str) -> dict:
+    """Fields stored on every class document so search can use indexes."""
+    normalized = normalize_name(name)
+    return {"nameNormalized": normalized, "nameTrigrams": trigrams(normalized)}
+
+
+async def backfill_search_fields(batch_size: int = 500) -> int:
+    """Adds search fields to classes created before they existed; run at startup."""
+    updated = 0
+    batch = []
+    async for doc in classes_collection.find({"nameTrigrams": {"$exists": False}}, {"name": 1}):
+        batch.append(UpdateOne({"_id": doc["_id"]}, {"$set": search_fields(doc.get("name", ""))}))
+        if len(batch) >= batch_size:
+            await classes_collection.bulk_write(batch, ordered=False)
+            updated += len(batch)
+            batch = []
+    if batch:
+        await classes_collection.bulk_write(batch, ordered=False)
+        updated += len(batch)
+    return updated
+
+
+class AutocompleteIndex:
+    """
+    Sorted (token, class_id) pairs for prefix lookups with bisect.
+
+    Tokens are the full normalized name plus each of its words, so "data"
+    finds "CS 201 – Data Structures". Kept up to date by the class routes and
+    fully reloaded every SEARCH_REFRESH_SECONDS by a background task (see
+    start()), never on the request path.
+    """
+
+    def __init__(self):
+        self._entries: list[tuple[str, str]] = []
+        self._names: dict[str, str] = {}
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        # Changes made while load() reads Mongo, replayed onto its result;
+        # (class_id, name), with name None for a removal.
+        self._pending: list[tuple[str, str | None]] | None = None
+
+    @staticmethod
+    def _tokens(normalized: str) -> set[str]:
+        return {normalized, *normalized.split()} - {""}
+
+    def add(self, class_id, name: str) -> None:
+        class_id = str(class_id)
+        if self._pending is not None:
+            self._pending.append((class_id, name))
+        self._remove(class_id)
+        normalized = normalize_name(name)
+        self._names[class_id] = normalized
+        for token in self._tokens(normalized):
+            bisect.insort(self._entries, (token, class_id))
+
+    def remove(self, class_id) -> None:
+        class_id = str(class_id)
+        if self._pending is not None:
+            self._pending.append((class_id, None))
+        self._remove(class_id)
+
+    def _remove(self, class_id: str) -> None:
+        normalized = self._names.pop(class_id, None)
+        if normalized is None:
+            return
+        for token in self._tokens(normalized):
+            i = bisect.bisect_left(self._entries, (token, class_id))
+            if i < len(self._entries) and self._entries[i] == (token, class_id):
+                del self._entries[i]
+
+    def prefix(self, query: str, limit: int) -> dict[str, float]:
+        """
+        The `limit` best class_id -> score; 1.0 when the whole name starts
+        with the query. Scans every match, so a whole-name match is never
+        cut off by word matches that sort before it.
+        """
+        scores: dict[str, float] = {}
+        i = bisect.bisect_left(self._entries, (query, ""))
+        while i < len(self._entries) and self._entries[i][0].startswith(query):
+            class_id = self._entries[i][1]
+            score = 1.0 if self._names[class_id].startswith(query) else 0.9
+            scores[class_id] = max(scores.get(class_id, 0.0), score)
+            i += 1
+        # Same order as search_class_ids, so truncating here loses nothing.
+        best = sorted(scores, key=lambda class_id: (-scores[class_id], class_id))[:limit]
+        return {class_id: scores[class_id] for class_id in best}
+
+    async def load(self) -> None:
+        # One reload at a time; a caller that waited gets a fresh index anyway.
+        async with self._lock:
+            self._pending = []
+            try:
+                entries = []
+                names = {}
+                async for doc in classes_collection.find({}, {"name": 1, "nameNormalized": 1}):
+                    # Not backfilled yet (see backfill_search_fields): index it anyway.
+                    normalized = doc.get("nameNormalized") or normalize_name(doc.get("name", ""))
+                    class_id = str(doc["_id"])
+                    names[class_id] = normalized
+                    entries += [(token, class_id) for token in self._tokens(normalized)]
+
+                entries.sort()
+                pending = self._pending
+            finally:
+                self._pending = None
+
+            self._entries, self._names = entries, names
+            # The read may have missed these, or seen them before they happened.
+            for class_id, name in pending:
+                if name is None:
+                    self._remove(class_id)
+                else:
+                    self.add(class_id, name)
+
+    async def _refresh_forever(self) -> None:
+        while True:
+            await asyncio.sleep(SEARCH_REFRESH_SECONDS)
+            try:
+                await self.load()
+            except Exception as e:
+                # Keep serving the last index; try again next round.
+                print("Search index refresh failed:", e)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_forever(), name="search-index-refresh")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+class_search_index = AutocompleteIndex()
+
+
+async def _fuzzy(normalized: str, limit: int) -> dict[str, float]:
+    grams = trigrams(normalized)
+    if not grams:
+        return {}
+
+    pipeline = [
+        {"$match": {"nameTrigrams": {"$in": grams}}},
+        # nameTrigrams holds no duplicates, so this counts shared trigrams.
+        {"$project": {"shared": {"$size": {"$filter": {
+            "input": "$nameTrigrams",
+            "cond": {"$in": ["$$this", grams]},
+        }}}}},
+        {"$sort": {"shared": -1}},
+        {"$limit": limit * 4},
+    ]
+    scores = {}
+    async for doc in classes_collection.aggregate(pipeline):
+        similarity = doc["shared"] / len(grams)
+        if similarity >= SEARCH_MIN_SIMILARITY:
+            # Scaled so a fuzzy match never outranks a prefix match.
+            scores[str(doc["_id"])] = similarity * 0.9
+    return scores
+
+
+async def search_class_ids(query: str, limit: int) -> list[ObjectId]:
+    """Best matching class ids, best first: prefix matches, then fuzzy ones."""
+    normalized = normalize_name(query)
+    if not normalized:
+        return []
+
+    scores = class_search_index.prefix(normalized, limit)
+    if len(normalized) >= 3:
+        for class_id, score in (await _fuzzy(normalized, limit)).items():
+            scores[class_id] = max(scores.get(class_id, 0.0), score)
+
+    ranked = sorted(scores, key=lambda class_id: (-scores[class_id], class_id))
+    return [ObjectId(class_id) for class_id in ranked[:limit]]
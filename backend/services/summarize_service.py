@@ -1,30 +1,127 @@
-import google.generativeai as genai
+import asyncio
 import os
-from dotenv import load_dotenv
+from io import BytesIO
 
-load_dotenv()
+from backend.services.summarizer import build_summarizer
+from backend.utils.pdf_utils import extract_pages_parallel
 
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+# Part of the summary cache key (as summarizer.name), so changing the model or
+# any prompt invalidates old summaries.
+SUMMARY_MODEL = os.getenv("SUMMARY_MODEL", "gemini-1.5-flash")  # Vision-capable model
+SUMMARY_PROMPT = """
+    You are an AI assistant that summarizes handwritten or photographed notes.
+    Extract the text from the PDF pages and produce a clean, structured summary.
+    Use bullet points and highlight key ideas.
+    """
+SUMMARY_TEXT_PROMPT = """
+    You are an AI assistant that summarizes lecture notes.
+    Produce a clean, structured summary of the text below.
+    Use bullet points and highlight key ideas.
+    """
+SUMMARY_MERGE_PROMPT = """
+    You are an AI assistant that summarizes lecture notes.
+    Below are summaries of consecutive parts of one document, in order.
+    Merge them into a single clean, structured summary without repeating points.
+    Use bullet points and highlight key ideas.
+    """
 
-def summarize_pdf_with_gemini_vision(file_bytes: bytes):
+# A page with at least this much extracted text is summarized from its text;
+# anything less (photos, scans) goes to the vision model.
+SUMMARY_MIN_PAGE_CHARS = int(os.getenv("SUMMARY_MIN_PAGE_CHARS", "200"))
+# Long documents are split into chunks of about this many characters (text) or
+# pages (vision), summarized concurrently and then merged.
+SUMMARY_CHUNK_CHARS = int(os.getenv("SUMMARY_CHUNK_CHARS", "30000"))
+SUMMARY_CHUNK_PAGES = int(os.getenv("SUMMARY_CHUNK_PAGES", "20"))
+SUMMARY_MAX_CONCURRENCY = int(os.getenv("SUMMARY_MAX_CONCURRENCY", "4"))
+
+
+summarizer = build_summarizer(SUMMARY_MODEL)
+
+
+async def summarize_pdf_with_vision(file_bytes: bytes) -> str:
     """
-    Sends the PDF bytes directly to Gemini Vision.
-    Gemini will read the images inside the PDF and summarize them.
+    Sends the PDF bytes directly to the vision model.
+    It will read the images inside the PDF and summarize them.
     """
+    return await summarizer.generate(SUMMARY_PROMPT, file_bytes)
 
-    model = genai.GenerativeModel("gemini-1.5-flash")  # Vision-capable model
 
-    prompt = """
-    You are an AI assistant that summarizes handwritten or photographed notes.
-    Extract the text from the PDF pages and produce a clean, structured summary.
-    Use bullet points and highlight key ideas.
+async def summarize_text(text: str) -> str:
+    return await summarizer.generate(SUMMARY_TEXT_PROMPT, text)
+
+
+async def merge_summaries(summaries: list[str]) -> str:
+    parts = "\n\n".join(f"Part {i}:\n{summary}" for i, summary in enumerate(summaries, start=1))
+    return await summarizer.generate(SUMMARY_MERGE_PROMPT, parts)
+
+
+def plan_summary(pages: list[str]) -> list[tuple[str, object]]:
     """
+    Splits a document into chunks to summarize, in page order:
+    ("text", str) for runs of pages with a usable text layer and
+    ("vision", [page indices]) for runs of image-only pages.
+    """
+    chunks: list[tuple[str, list]] = []
+    chunk_chars = 0
+    for i, text in enumerate(pages):
+        text = text.strip()
+        kind = "text" if len(text) >= SUMMARY_MIN_PAGE_CHARS else "vision"
+        if chunks and chunks[-1][0] == kind and (
+            chunk_chars + len(text) <= SUMMARY_CHUNK_CHARS
+            if kind == "text"
+            else len(chunks[-1][1]) < SUMMARY_CHUNK_PAGES
+        ):
+            chunks[-1][1].append(text if kind == "text" else i)
+        else:
+            chunks.append((kind, [text if kind == "text" else i]))
+            chunk_chars = 0
+        chunk_chars += len(text)
+
+    return [
+        (kind, "\n\n".join(content) if kind == "text" else content)
+        for kind, content in chunks
+    ]
+
+
+def pdf_subset(file_bytes: bytes, page_indices: list[int]) -> bytes:
+    """A PDF holding only the given pages, so vision calls upload just those."""
+    from pypdf import PdfReader, PdfWriter
+
+    reader = PdfReader(BytesIO(file_bytes))
+    writer = PdfWriter()
+    for i in page_indices:
+        writer.add_page(reader.pages[i])
+    out = BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+async def summarize_pdf(file_bytes: bytes) -> str:
+    """
+    Summarizes a PDF, using its text layer where it has one and the vision
+    model only for image pages. Long documents are summarized in chunks,
+    concurrently, and the partial summaries merged with one more call.
+    """
+    try:
+        pages = await extract_pages_parallel(file_bytes)
+    except Exception:
+        # Unreadable for pypdf (or the pool is full): let the model see it all.
+        pages = []
+
+    chunks = plan_summary(pages)
+    if not chunks or (len(chunks) == 1 and chunks[0][0] == "vision"):
+        return await summarize_pdf_with_vision(file_bytes)
+
+    slots = asyncio.Semaphore(SUMMARY_MAX_CONCURRENCY)
 
-    response = model.generate_content(
-        [
-            prompt,
-            {"mime_type": "application/pdf", "data": file_bytes}
-        ]
-    )
+    async def summarize_chunk(kind: str, content) -> str:
+        async with slots:
+            if kind == "text":
+                return await summarize_text(content)
+            subset = await asyncio.to_thread(pdf_subset, file_bytes, content)
+            return await summarize_pdf_with_vision(subset)
 
-    return response.text
+    summaries = await asyncio.gather(*(summarize_chunk(kind, content) for kind, content in chunks))
+    if len(summaries) == 1:
+        return summaries[0]
+    return await merge_summaries(summaries)
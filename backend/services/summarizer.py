@@ -0,0 +1,274 @@
+import asyncio
+import hashlib
+import os
+import random
+import re
+import time
+from abc import ABC, abstractmethod
+
+from backend.utils.metrics import time_upstream
+
+# Backends that turn a prompt plus text or PDF bytes into a summary, and
+# wrappers that add rate limiting, retries, timeouts and a circuit breaker
+# around any of them. build_summarizer() assembles the stack from env vars.
+SUMMARIZER_BACKEND = os.getenv("SUMMARIZER_BACKEND", "gemini")  # or "local"
+SUMMARIZER_RATE_PER_SECOND = float(os.getenv("SUMMARIZER_RATE_PER_SECOND", "2"))
+SUMMARIZER_BURST = int(os.getenv("SUMMARIZER_BURST", "4"))
+SUMMARIZER_TIMEOUT_SECONDS = float(os.getenv("SUMMARIZER_TIMEOUT_SECONDS", "60"))
+SUMMARIZER_RETRIES = int(os.getenv("SUMMARIZER_RETRIES", "3"))
+SUMMARIZER_BREAKER_FAILURES = int(os.getenv("SUMMARIZER_BREAKER_FAILURES", "5"))
+SUMMARIZER_BREAKER_RESET_SECONDS = float(os.getenv("SUMMARIZER_BREAKER_RESET_SECONDS", "30"))
+# Simulated model latency for the local backend, e.g. in load tests.
+SUMMARIZER_LOCAL_LATENCY_SECONDS = float(os.getenv("SUMMARIZER_LOCAL_LATENCY_SECONDS", "0"))
+
+
+class SummarizerUnavailable(RuntimeError):
+    """Raised without calling the backend while the circuit breaker is open."""
+
+
+class Summarizer(ABC):
+    """
+    Interface for summarizer backends and wrappers.
+
+    `content` is either text or the bytes of a PDF. `name` identifies the
+    model, and is part of the summary cache key.
+    """
+
+    name = "summarizer"
+
+    @abstractmethod
+    async def generate(self, prompt: str, content: str | bytes) -> str:
+        ...
+
+    def stats(self) -> dict:
+        return {}
+
+
+class GeminiSummarizer(Summarizer):
+    """Gemini through the google-generativeai SDK, with one reused model client."""
+
+    def __init__(self, model: str, api_key: str | None = None, timeout: float | None = None):
+        self.name = model
+        self.api_key = api_key
+        self.timeout = timeout
+        self._model = None
+
+    def _client(self):
+        # The SDK and the API key are only loaded by the first summary.
+        if self._model is None:
+            import google.generativeai as genai
+
+            genai.configure(api_key=self.api_key or os.getenv("GEMINI_API_KEY"))
+            self._model = genai.GenerativeModel(self.name)
+        return self._model
+
+    def _generate(self, prompt: str, content: str | bytes) -> str:
+        part = {"mime_type": "application/pdf", "data": content} if isinstance(content, bytes) else content
+        options = {"timeout": self.timeout} if self.timeout else None
+        with time_upstream("gemini", "generate_pdf" if isinstance(content, bytes) else "generate_text"):
+            return self._client().generate_content([prompt, part], request_options=options).text
+
+    async def generate(self, prompt: str, content: str | bytes) -> str:
+        # The SDK blocks, so keep it off the event loop.
+        return await asyncio.to_thread(self._generate, prompt, content)
+
+
+class LocalSummarizer(Summarizer):
+    """
+    Deterministic stand-in for tests and load runs: the same input always
+    gives the same summary, and no network is involved.
+    """
+
+    name = "local"
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    async def generate(self, prompt: str, content: str | bytes) -> str:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if isinstance(content, bytes):
+            digest = hashlib.sha256(content).hexdigest()[:12]
+            return f"- PDF of {len(content)} bytes ({digest})"
+
+        sentences = [s.strip() for s in re.split(r"(?<=[.!?])\s+|\n+", content) if s.strip()]
+        return "\n".join(f"- {sentence[:200]}" for sentence in sentences[:5])
+
+
+class RateLimitedSummarizer(Summarizer):
+    """Token bucket: `rate` calls per second on average, bursts up to `burst`."""
+
+    def __init__(self, inner: Summarizer, rate: float, burst: int):
+        self.inner = inner
+        self.name = inner.name
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._waited = 0.0
+
+    async def _acquire(self) -> None:
+        # The lock makes callers queue up in order for the next token.
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+                self._waited += delay
+                await asyncio.sleep(delay)
+
+    async def generate(self, prompt: str, content: str | bytes) -> str:
+        if self.rate > 0:
+            await self._acquire()
+        return await self.inner.generate(prompt, content)
+
+    def stats(self) -> dict:
+        return {
+            **self.inner.stats(),
+            "rate_limit": {
+                "rate": self.rate,
+                "burst": self.burst,
+                "tokens": round(self._tokens, 2),
+                "waited_seconds": round(self._waited, 3),
+            },
+        }
+
+
+class TimeoutSummarizer(Summarizer):
+    def __init__(self, inner: Summarizer, seconds: float):
+        self.inner = inner
+        self.name = inner.name
+        self.seconds = seconds
+        self._timeouts = 0
+
+    async def generate(self, prompt: str, content: str | bytes) -> str:
+        try:
+            return await asyncio.wait_for(self.inner.generate(prompt, content), self.seconds)
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            raise TimeoutError(f"Summarizer timed out after {self.seconds}s") from None
+
+    def stats(self) -> dict:
+        return {**self.inner.stats(), "timeouts": self._timeouts}
+
+
+class RetryingSummarizer(Summarizer):
+    """
+    Retries failed calls up to `retries` more times with exponential backoff
+    and full jitter, so many callers failing together don't retry together.
+    """
+
+    def __init__(self, inner: Summarizer, retries: int, base_delay: float = 0.5, max_delay: float = 8.0):
+        self.inner = inner
+        self.name = inner.name
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._retried = 0
+
+    async def generate(self, prompt: str, content: str | bytes) -> str:
+        attempt = 0
+        while True:
+            try:
+                return await self.inner.generate(prompt, content)
+            except (ValueError, SummarizerUnavailable):
+                # Bad input won't get better by asking again.
+                raise
+            except Exception:
+                if attempt >= self.retries:
+                    raise
+            delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+            await asyncio.sleep(random.uniform(0, delay))
+            attempt += 1
+            self._retried += 1
+
+    def stats(self) -> dict:
+        return {**self.inner.stats(), "retries": self._retried}
+
+
+class CircuitBreakerSummarizer(Summarizer):
+    """
+    After `failures` failed calls in a row, fails fast with
+    SummarizerUnavailable for `reset_seconds`, then lets one trial call
+    through: success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, inner: Summarizer, failures: int, reset_seconds: float):
+        self.inner = inner
+        self.name = inner.name
+        self.failures = failures
+        self.reset_seconds = reset_seconds
+        self._consecutive = 0
+        self._opened_at: float | None = None
+        self._trial_running = False
+        self._rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_seconds:
+            return "half-open"
+        return "open"
+
+    async def generate(self, prompt: str, content: str | bytes) -> str:
+        state = self.state
+        if state == "open" or (state == "half-open" and self._trial_running):
+            self._rejected += 1
+            raise SummarizerUnavailable("Summarizer is unavailable, try again later.")
+
+        trial = state == "half-open"
+        if trial:
+            self._trial_running = True
+        try:
+            summary = await self.inner.generate(prompt, content)
+        except ValueError:
+            raise
+        except Exception:
+            self._consecutive += 1
+            if trial or self._consecutive >= self.failures:
+                self._opened_at = time.monotonic()
+            raise
+        else:
+            self._consecutive = 0
+            self._opened_at = None
+            return summary
+        finally:
+            if trial:
+                self._trial_running = False
+
+    def stats(self) -> dict:
+        return {
+            **self.inner.stats(),
+            "circuit": {
+                "state": self.state,
+                "consecutive_failures": self._consecutive,
+                "rejected": self._rejected,
+            },
+        }
+
+
+def build_summarizer(model: str) -> Summarizer:
+    if SUMMARIZER_BACKEND == "local":
+        summarizer: Summarizer = LocalSummarizer(SUMMARIZER_LOCAL_LATENCY_SECONDS)
+    elif SUMMARIZER_BACKEND == "gemini":
+        summarizer = GeminiSummarizer(model, timeout=SUMMARIZER_TIMEOUT_SECONDS)
+    else:
+        raise RuntimeError(f"Unknown SUMMARIZER_BACKEND: {SUMMARIZER_BACKEND}")
+
+    # Each attempt waits for a token and gets its own timeout; the breaker
+    # sees the outcome after retries.
+    summarizer = TimeoutSummarizer(summarizer, SUMMARIZER_TIMEOUT_SECONDS)
+    summarizer = RateLimitedSummarizer(summarizer, SUMMARIZER_RATE_PER_SECOND, SUMMARIZER_BURST)
+    summarizer = RetryingSummarizer(summarizer, SUMMARIZER_RETRIES)
+    return CircuitBreakerSummarizer(
+        summarizer,
+        SUMMARIZER_BREAKER_FAILURES,
+        SUMMARIZER_BREAKER_RESET_SECONDS,
+    )
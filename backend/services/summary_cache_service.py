@@ -0,0 +1,158 @@
+import asyncio
+import hashlib
+import os
+from collections import OrderedDict
+from datetime import datetime
+from typing import Awaitable, Callable
+
+from backend.database import summary_cache_collection
+from backend.services.summarize_service import (
+    SUMMARY_MERGE_PROMPT,
+    SUMMARY_PROMPT,
+    SUMMARY_TEXT_PROMPT,
+    summarizer,
+)
+
+# Upper bound on the summary text kept in this process, in bytes.
+SUMMARY_CACHE_MAX_BYTES = int(os.getenv("SUMMARY_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+
+_PROMPT_VERSION = hashlib.sha256(
+    "\0".join((SUMMARY_PROMPT, SUMMARY_TEXT_PROMPT, SUMMARY_MERGE_PROMPT)).encode("utf-8")
+).hexdigest()[:16]
+
+# How a cached summary is stored in the database.
+# {
+#   "_id": "<sha256 of model, prompts and PDF bytes>",
+#   "summary": "...",
+#   "model": "gemini-1.5-flash",
+#   "createdAt": datetime
+# }
+
+
+def summary_cache_key(file_bytes: bytes) -> str:
+    digest = hashlib.sha256()
+    digest.update(f"{summarizer.name}\0{_PROMPT_VERSION}\0".encode("utf-8"))
+    digest.update(file_bytes)
+    return digest.hexdigest()
+
+
+class SummaryCache:
+    """
+    Two-tier cache of summaries keyed by the PDF content.
+
+    An in-process LRU (bounded by total summary size) sits in front of the
+    summary_cache collection. Concurrent misses for the same PDF share a
+    single model call instead of each paying for one.
+    """
+
+    def __init__(self, max_bytes: int = SUMMARY_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lru: OrderedDict[str, str] = OrderedDict()
+        self._size = 0
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._stats = {
+            "memory_hits": 0,
+            "store_hits": 0,
+            "misses": 0,
+            "shared_inflight": 0,
+            "evictions": 0,
+        }
+
+    def _remember(self, key: str, summary: str) -> None:
+        if key in self._lru:
+            self._size -= len(self._lru.pop(key).encode("utf-8"))
+
+        size = len(summary.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        self._lru[key] = summary
+        self._size += size
+        while self._size > self.max_bytes:
+            _, evicted = self._lru.popitem(last=False)
+            self._size -= len(evicted.encode("utf-8"))
+            self._stats["evictions"] += 1
+
+    def _from_memory(self, key: str) -> str | None:
+        summary = self._lru.get(key)
+        if summary is not None:
+            self._lru.move_to_end(key)
+            self._stats["memory_hits"] += 1
+        return summary
+
+    async def _from_store(self, key: str) -> str | None:
+        doc = await summary_cache_collection.find_one({"_id": key}, {"summary": 1})
+        if not doc:
+            return None
+        self._stats["store_hits"] += 1
+        self._remember(key, doc["summary"])
+        return doc["summary"]
+
+    async def lookup(self, file_bytes: bytes) -> str | None:
+        key = summary_cache_key(file_bytes)
+        summary = self._from_memory(key)
+        if summary is None:
+            summary = await self._from_store(key)
+        return summary
+
+    async def get_or_compute(
+        self,
+        file_bytes: bytes,
+        compute: Callable[[bytes], Awaitable[str]],
+    ) -> str:
+        key = summary_cache_key(file_bytes)
+
+        summary = self._from_memory(key)
+        if summary is not None:
+            return summary
+
+        if key in self._inflight:
+            self._stats["shared_inflight"] += 1
+            return await asyncio.shield(self._inflight[key])
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            summary = await self._from_store(key)
+            if summary is None:
+                self._stats["misses"] += 1
+                summary = await compute(file_bytes)
+                self._remember(key, summary)
+                await summary_cache_collection.update_one(
+                    {"_id": key},
+                    {"$set": {
+                        "summary": summary,
+                        "model": summarizer.name,
+                        "createdAt": datetime.utcnow(),
+                    }},
+                    upsert=True,
+                )
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark it retrieved so asyncio doesn't warn when nobody was waiting.
+            future.exception()
+            raise
+        else:
+            future.set_result(summary)
+        finally:
+            del self._inflight[key]
+
+        return summary
+
+    def stats(self) -> dict:
+        hits = self._stats["memory_hits"] + self._stats["store_hits"]
+        lookups = hits + self._stats["misses"]
+        return {
+            **self._stats,
+            "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self._lru),
+            "bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "inflight": len(self._inflight),
+        }
+
+
+summary_cache = SummaryCache()
@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+
+from bson import Binary, ObjectId
+from pymongo import ReturnDocument
+
+from backend.database import summary_jobs_collection
+from backend.services.summarize_service import summarize_pdf
+from backend.services.summary_cache_service import summary_cache
+
+# Number of jobs summarized at the same time by this process.
+SUMMARY_WORKERS = int(os.getenv("SUMMARY_WORKERS", "2"))
+# How long a worker waits for a wake-up before checking Mongo again. Jobs
+# submitted by other processes are picked up at least this often.
+SUMMARY_POLL_SECONDS = float(os.getenv("SUMMARY_POLL_SECONDS", "5"))
+# A job left "running" for longer than this (e.g. the process died) is
+# handed back to the queue.
+SUMMARY_JOB_LEASE_SECONDS = int(os.getenv("SUMMARY_JOB_LEASE_SECONDS", "300"))
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+logger = logging.getLogger(__name__)
+
+# How a summary job is stored in the database.
+# {
+#   "_id": ObjectId,
+#   "status": "queued" | "running" | "done" | "failed",
+#   "pdf": Binary,           # removed once the job finishes
+#   "summary": "...",
+#   "error": "...",
+#   "createdAt": datetime,
+#   "startedAt": datetime,
+#   "finishedAt": datetime
+# }
+
+
+def job_to_out(doc: dict) -> dict:
+    return {
+        "job_id": str(doc["_id"]),
+        "status": doc["status"],
+        "summary": doc.get("summary"),
+        "error": doc.get("error"),
+        "createdAt": doc["createdAt"].isoformat() if doc.get("createdAt") else None,
+        "finishedAt": doc["finishedAt"].isoformat() if doc.get("finishedAt") else None,
+    }
+
+
+class SummaryJobQueue:
+    """
+    Mongo-backed queue of summary jobs worked by a pool of asyncio tasks.
+
+    Mongo is the source of truth: workers claim jobs with an atomic
+    find_one_and_update, so queued jobs survive restarts and several API
+    processes can share the same collection.
+    """
+
+    def __init__(self, workers: int = SUMMARY_WORKERS):
+        self.workers = max(1, workers)
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+
+    async def submit(self, file_bytes: bytes) -> dict:
+        now = datetime.utcnow()
+        cached = await summary_cache.lookup(file_bytes)
+        if cached is not None:
+            # Same PDF was summarized before: record the job as already done.
+            doc = {
+                "status": DONE,
+                "summary": cached,
+                "createdAt": now,
+                "finishedAt": now,
+            }
+            result = await summary_jobs_collection.insert_one(doc)
+            doc["_id"] = result.inserted_id
+            return job_to_out(doc)
+
+        doc = {
+            "status": QUEUED,
+            "pdf": Binary(file_bytes),
+            "createdAt": now,
+        }
+        result = await summary_jobs_collection.insert_one(doc)
+        doc["_id"] = result.inserted_id
+        self._wakeup.set()
+        return job_to_out(doc)
+
+    async def get(self, job_id: str) -> dict | None:
+        try:
+            job_obj_id = ObjectId(job_id)
+        except Exception as e:
+            raise ValueError("Invalid job_id") from e
+
+        doc = await summary_jobs_collection.find_one(
+            {"_id": job_obj_id},
+            {"pdf": 0},
+        )
+        return job_to_out(doc) if doc else None
+
+    async def _claim(self) -> dict | None:
+        now = datetime.utcnow()
+        stale = now - timedelta(seconds=SUMMARY_JOB_LEASE_SECONDS)
+        return await summary_jobs_collection.find_one_and_update(
+            {"$or": [
+                {"status": QUEUED},
+                {"status": RUNNING, "startedAt": {"$lt": stale}},
+            ]},
+            {"$set": {"status": RUNNING, "startedAt": now}},
+            sort=[("createdAt", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _process(self, job: dict) -> None:
+        try:
+            summary = await summary_cache.get_or_compute(bytes(job["pdf"]), summarize_pdf)
+            update = {"status": DONE, "summary": summary}
+        except Exception as e:
+            update = {"status": FAILED, "error": str(e)}
+
+        update["finishedAt"] = datetime.utcnow()
+        await summary_jobs_collection.update_one(
+            {"_id": job["_id"]},
+            {"$set": update, "$unset": {"pdf": ""}},
+        )
+
+    async def _worker(self) -> None:
+        while True:
+            try:
+                job = await self._claim()
+                if job is not None:
+                    await self._process(job)
+                    continue
+            except Exception:
+                # The job's lease runs out and another pass picks it up again.
+                logger.exception("Summary worker failed; retrying")
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), SUMMARY_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"summary-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+summary_job_queue = SummaryJobQueue()
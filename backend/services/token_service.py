@@ -0,0 +1,105 @@
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+import time
+
+# Stateless session tokens: "<payload>.<signature>", both base64url, where the
+# payload is compact JSON and the signature is HMAC-SHA256 over it. Checking
+# one is a hash and a JSON parse, with no database read.
+#
+# Access tokens are short-lived and sent as "Authorization: Bearer ...".
+# Refresh tokens live longer and are only accepted by POST /api/auth/refresh.
+#
+# AUTH_TOKEN_SECRET must be set, and shared by every API process; the app
+# refuses to start without it. For local development only,
+# AUTH_ALLOW_EPHEMERAL_SECRET=1 lets each process make up its own instead
+# (tokens then stop working across processes and restarts).
+AUTH_ACCESS_TOKEN_TTL_SECONDS = int(os.getenv("AUTH_ACCESS_TOKEN_TTL_SECONDS", str(15 * 60)))
+AUTH_REFRESH_TOKEN_TTL_SECONDS = int(os.getenv("AUTH_REFRESH_TOKEN_TTL_SECONDS", str(30 * 24 * 3600)))
+AUTH_ALLOW_EPHEMERAL_SECRET = os.getenv("AUTH_ALLOW_EPHEMERAL_SECRET", "").lower() in ("1", "true", "yes")
+
+ACCESS = "access"
+REFRESH = "refresh"
+
+_secret: bytes | None = None
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidToken(ValueError):
+    pass
+
+
+def signing_key() -> bytes:
+    """Raises RuntimeError if AUTH_TOKEN_SECRET is unset; called at startup so that fails early."""
+    global _secret
+    if _secret is None:
+        configured = os.getenv("AUTH_TOKEN_SECRET")
+        if configured:
+            _secret = configured.encode("utf-8")
+        elif AUTH_ALLOW_EPHEMERAL_SECRET:
+            logger.warning("AUTH_TOKEN_SECRET is not set; using a per-process secret (development only)")
+            _secret = secrets.token_bytes(32)
+        else:
+            raise RuntimeError(
+                "AUTH_TOKEN_SECRET is not set. Set it to the same random value for every "
+                "API process, or AUTH_ALLOW_EPHEMERAL_SECRET=1 for local development."
+            )
+    return _secret
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _sign(payload: str) -> str:
+    return _b64encode(hmac.new(signing_key(), payload.encode("ascii"), hashlib.sha256).digest())
+
+
+def issue_token(email: str, user_id: str, kind: str = ACCESS, now: float | None = None) -> str:
+    issued = int(now if now is not None else time.time())
+    ttl = AUTH_ACCESS_TOKEN_TTL_SECONDS if kind == ACCESS else AUTH_REFRESH_TOKEN_TTL_SECONDS
+    claims = {"sub": email, "uid": user_id, "typ": kind, "iat": issued, "exp": issued + ttl}
+    payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+    return f"{payload}.{_sign(payload)}"
+
+
+def issue_token_pair(email: str, user_id: str) -> dict:
+    """What login, refresh and an email change hand back to the client."""
+    return {
+        "access_token": issue_token(email, user_id, ACCESS),
+        "refresh_token": issue_token(email, user_id, REFRESH),
+        "token_type": "bearer",
+        "expires_in": AUTH_ACCESS_TOKEN_TTL_SECONDS,
+    }
+
+
+def verify_token(token: str, kind: str = ACCESS, now: float | None = None) -> dict:
+    """Returns the token's claims; raises InvalidToken if it is forged, malformed, expired or the wrong kind."""
+    # Tokens we issue are base64url; anything else can't be one of ours.
+    if not token.isascii():
+        raise InvalidToken("Malformed token")
+    payload, _, signature = token.partition(".")
+    if not payload or not signature:
+        raise InvalidToken("Malformed token")
+    if not hmac.compare_digest(signature, _sign(payload)):
+        raise InvalidToken("Bad token signature")
+
+    try:
+        claims = json.loads(_b64decode(payload))
+    except ValueError as e:
+        raise InvalidToken("Malformed token") from e
+
+    if claims.get("typ") != kind:
+        raise InvalidToken(f"Wrong token type, expected {kind}")
+    if claims.get("exp", 0) <= (now if now is not None else time.time()):
+        raise InvalidToken("Token expired")
+    return claims
@@ -1,42 +1,98 @@
+import asyncio
+import io
 import os
 from datetime import datetime
+from typing import BinaryIO
 
 from bson import ObjectId
-from dotenv import load_dotenv
 
-import cloudinary
-import cloudinary.uploader
-from cloudinary.exceptions import Error as CloudinaryError
+from backend.services import note_service
+from backend.services.image_service import (
+    IMAGE_MAX_WORKERS,
+    image_executor,
+    image_metrics,
+    preprocess_image,
+)
+from backend.utils.bounded_executor import BoundedExecutor
+from backend.utils.metrics import time_upstream
+from backend.utils.pdf_builder import build_pdf
 
-from backend.database import classes_collection
+_cloudinary = None
 
-load_dotenv()
 
-CLOUD_NAME = os.getenv("CLOUDINARY_CLOUD_NAME")
-API_KEY = os.getenv("CLOUDINARY_API_KEY")
-API_SECRET = os.getenv("CLOUDINARY_API_SECRET")
+def cloudinary_sdk():
+    """
+    Imports and configures the Cloudinary SDK on first use, so the API starts
+    quickly and without credentials; only uploads need them.
+    """
+    global _cloudinary
+    if _cloudinary is None:
+        cloud_name = os.getenv("CLOUDINARY_CLOUD_NAME")
+        api_key = os.getenv("CLOUDINARY_API_KEY")
+        api_secret = os.getenv("CLOUDINARY_API_SECRET")
+
+        if not cloud_name or not api_key or not api_secret:
+            raise RuntimeError(
+                "Cloudinary config missing. Set CLOUDINARY_CLOUD_NAME, CLOUDINARY_API_KEY, CLOUDINARY_API_SECRET in backend/.env"
+            )
+
+        import cloudinary
+        import cloudinary.uploader
+
+        cloudinary.config(
+            cloud_name=cloud_name,
+            api_key=api_key,
+            api_secret=api_secret,
+            secure=True,
+        )
+        _cloudinary = cloudinary
+    return _cloudinary
 
-if not CLOUD_NAME or not API_KEY or not API_SECRET:
-    raise RuntimeError(
-        "Cloudinary config missing. Set CLOUDINARY_CLOUD_NAME, CLOUDINARY_API_KEY, CLOUDINARY_API_SECRET in backend/.env"
-    )
 
-cloudinary.config(
-    cloud_name=CLOUD_NAME,
-    api_key=API_KEY,
-    api_secret=API_SECRET,
-    secure=True,
+# Cloudinary's SDK is blocking, so uploads run on a small thread pool.
+# UPLOAD_MAX_WORKERS caps concurrent uploads; UPLOAD_MAX_QUEUE caps how many
+# more may wait before new uploads are turned away with a 503.
+UPLOAD_MAX_WORKERS = int(os.getenv("UPLOAD_MAX_WORKERS", "4"))
+UPLOAD_MAX_QUEUE = int(os.getenv("UPLOAD_MAX_QUEUE", "16"))
+
+# Largest accepted upload, and the chunk size used to stream it to Cloudinary
+# (Cloudinary requires chunks of at least 5 MB). Only one chunk per upload is
+# held in memory at a time.
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(15 * 1024 * 1024)))
+UPLOAD_CHUNK_BYTES = max(5 * 1024 * 1024, int(os.getenv("UPLOAD_CHUNK_BYTES", str(6 * 1024 * 1024))))
+# Most photos accepted for one lecture PDF; each is still capped at UPLOAD_MAX_BYTES.
+LECTURE_MAX_PAGES = int(os.getenv("LECTURE_MAX_PAGES", "50"))
+# Most files in one batch upload, and how many of them upload at once. The
+# concurrency stays within UPLOAD_MAX_WORKERS so one batch can't fill the queue.
+UPLOAD_BATCH_MAX_FILES = int(os.getenv("UPLOAD_BATCH_MAX_FILES", "50"))
+UPLOAD_BATCH_CONCURRENCY = min(
+    UPLOAD_MAX_WORKERS,
+    int(os.getenv("UPLOAD_BATCH_CONCURRENCY", str(UPLOAD_MAX_WORKERS))),
+)
+
+upload_executor = BoundedExecutor(
+    name="cloudinary-upload",
+    max_workers=UPLOAD_MAX_WORKERS,
+    max_queue=UPLOAD_MAX_QUEUE,
 )
 
-def upload_image_and_convert_to_pdf(file_bytes: bytes):
+
+def _upload_to_cloudinary(file: BinaryIO, filename: str | None = None, is_pdf: bool = False):
+    cloudinary = cloudinary_sdk()
+    from cloudinary.exceptions import Error as CloudinaryError
+
     try:
-        upload_result = cloudinary.uploader.upload(
-            file_bytes,
-            folder="notes-app",
-            resource_type="image",
-            type="upload",
-            access_mode="public",
-        )
+        # upload_large reads the (spooled) upload file one chunk at a time.
+        with time_upstream("cloudinary", "upload_pdf" if is_pdf else "upload_image"):
+            upload_result = cloudinary.uploader.upload_large(
+                file,
+                chunk_size=UPLOAD_CHUNK_BYTES,
+                filename=filename or "upload",
+                folder="notes-app",
+                resource_type="image",
+                type="upload",
+                access_mode="public",
+            )
 
         public_id = upload_result.get("public_id")
         secure_url = upload_result.get("secure_url")
@@ -44,6 +100,11 @@ def upload_image_and_convert_to_pdf(file_bytes: bytes):
         if not public_id or not secure_url:
             raise RuntimeError(f"Cloudinary upload missing fields: {upload_result}")
 
+        if is_pdf:
+            # The first page, rendered by Cloudinary, serves as the preview.
+            image_url = cloudinary.CloudinaryImage(public_id).build_url(format="jpg", page=1)
+            return {"imageUrl": image_url, "pdfUrl": secure_url}
+
         pdf_url = cloudinary.CloudinaryImage(public_id).build_url(format="pdf")
 
         return {"imageUrl": secure_url, "pdfUrl": pdf_url}
@@ -56,18 +117,100 @@ def upload_image_and_convert_to_pdf(file_bytes: bytes):
         raise RuntimeError(f"Upload/convert failed: {str(e)}") from e
 
 
+def file_size(file: BinaryIO) -> int:
+    position = file.tell()
+    file.seek(0, os.SEEK_END)
+    size = file.tell()
+    file.seek(position)
+    return size
+
+
+def check_upload_size(file: BinaryIO) -> None:
+    size = file_size(file)
+    if size == 0:
+        raise ValueError("Empty file upload.")
+    if size > UPLOAD_MAX_BYTES:
+        raise ValueError(f"Upload too large (max {UPLOAD_MAX_BYTES} bytes).")
+
+
+async def upload_image_and_convert_to_pdf(file: BinaryIO, filename: str | None = None):
+    """
+    Shrinks the image (see image_service) and streams it to Cloudinary.
+    Raises ValueError if it is empty, too large or not an image, and
+    ExecutorSaturated when a worker pool and its queue are full.
+    """
+    check_upload_size(file)
+
+    processed, stats = await preprocess_image(file)
+    processed.seek(0)
+    result = await upload_executor.run(_upload_to_cloudinary, processed, filename)
+    if stats:
+        result["preprocess"] = stats
+    return result
+
+
+async def upload_images_as_pdf(files: list[BinaryIO], filename: str | None = None):
+    """
+    Builds one PDF with a page per image, in the given order, and uploads it.
+    Pages are preprocessed concurrently; since that yields JPEGs, they are
+    embedded in the PDF without being encoded again. Raises like
+    upload_image_and_convert_to_pdf.
+    """
+    if not files:
+        raise ValueError("No files uploaded.")
+    if len(files) > LECTURE_MAX_PAGES:
+        raise ValueError(f"Too many pages (max {LECTURE_MAX_PAGES}).")
+    for file in files:
+        check_upload_size(file)
+
+    # One request may not take more than the pool's worth of slots, so a long
+    # lecture waits its turn instead of overflowing the queue for everyone.
+    slots = asyncio.Semaphore(IMAGE_MAX_WORKERS)
+
+    async def preprocess(file: BinaryIO):
+        async with slots:
+            return await preprocess_image(file)
+
+    processed = await asyncio.gather(*(preprocess(file) for file in files))
+    pages = []
+    for page, _ in processed:
+        page.seek(0)
+        pages.append(page.read())
+
+    pdf = await image_executor.run(build_pdf, pages)
+    result = await upload_executor.run(_upload_to_cloudinary, io.BytesIO(pdf), filename, True)
+    result["pageCount"] = len(pages)
+    return result
+
+
+def upload_metrics() -> dict:
+    return {
+        "upload": upload_executor.metrics(),
+        "preprocess": image_metrics(),
+    }
+
+
+async def _existing_class_id(class_id: str) -> ObjectId:
+    try:
+        class_obj_id = ObjectId(class_id)
+    except Exception as e:
+        raise ValueError("Invalid class_id") from e
+
+    if not await note_service.class_exists(class_obj_id):
+        raise LookupError("Class not found")
+    return class_obj_id
+
+
 async def upload_image_and_save_note(
-    file_bytes: bytes,
+    file: BinaryIO,
     class_id: str,
     uploaded_by: str,
     summary: str | None = None,
+    filename: str | None = None,
 ):
-    try:
-        class_obj_id = ObjectId(class_id)
-    except Exception as e:
-        raise ValueError("Invalid class_id") from e
+    class_obj_id = await _existing_class_id(class_id)
 
-    upload_result = upload_image_and_convert_to_pdf(file_bytes)
+    upload_result = await upload_image_and_convert_to_pdf(file, filename)
 
     note_id = ObjectId()
     note_doc = {
@@ -79,13 +222,41 @@ async def upload_image_and_save_note(
         "summary": summary,
     }
 
-    result = await classes_collection.update_one(
-        {"_id": class_obj_id},
-        {"$push": {"photos": note_doc}},
-    )
+    await note_service.insert_note(class_obj_id, note_doc)
 
-    if result.matched_count == 0:
-        raise LookupError("Class not found")
+    return {
+        "id": str(note_id),
+        **note_doc,
+        "_id": None,
+        "preprocess": upload_result.get("preprocess"),
+    }
+
+
+
+async def upload_lecture_and_save_note(
+    files: list[BinaryIO],
+    class_id: str,
+    uploaded_by: str,
+    summary: str | None = None,
+    filename: str | None = None,
+):
+    """Same as upload_image_and_save_note, but stores all pages as one PDF note."""
+    class_obj_id = await _existing_class_id(class_id)
+
+    upload_result = await upload_images_as_pdf(files, filename)
+
+    note_id = ObjectId()
+    note_doc = {
+        "_id": note_id,
+        "imageUrl": upload_result["imageUrl"],
+        "pdfUrl": upload_result["pdfUrl"],
+        "pageCount": upload_result["pageCount"],
+        "uploadedBy": uploaded_by,
+        "uploadedAt": datetime.utcnow().isoformat(),
+        "summary": summary,
+    }
+
+    await note_service.insert_note(class_obj_id, note_doc)
 
     return {
         "id": str(note_id),
@@ -93,3 +264,70 @@ async def upload_image_and_save_note(
         "_id": None,
     }
 
+
+async def upload_images_and_save_notes(
+    files: list[tuple[BinaryIO, str | None]],
+    class_id: str,
+    uploaded_by: str,
+    summary: str | None = None,
+):
+    """
+    Uploads (file, filename) pairs concurrently, UPLOAD_BATCH_CONCURRENCY at a
+    time, and saves every successful one as a note in a single insert.
+    A failed file doesn't fail the batch: results has one entry per file, in
+    the order they were given, with either the note or the error.
+    """
+    if not files:
+        raise ValueError("No files uploaded.")
+    if len(files) > UPLOAD_BATCH_MAX_FILES:
+        raise ValueError(f"Too many files (max {UPLOAD_BATCH_MAX_FILES}).")
+
+    class_obj_id = await _existing_class_id(class_id)
+
+    slots = asyncio.Semaphore(UPLOAD_BATCH_CONCURRENCY)
+
+    async def upload(file: BinaryIO, filename: str | None):
+        async with slots:
+            return await upload_image_and_convert_to_pdf(file, filename)
+
+    uploads = await asyncio.gather(
+        *(upload(file, filename) for file, filename in files),
+        return_exceptions=True,
+    )
+
+    uploaded_at = datetime.utcnow().isoformat()
+    note_docs = []
+    results = []
+    for index, ((_, filename), upload_result) in enumerate(zip(files, uploads)):
+        if isinstance(upload_result, Exception):
+            results.append({
+                "index": index,
+                "filename": filename,
+                "ok": False,
+                "error": str(upload_result),
+            })
+            continue
+
+        note_doc = {
+            "_id": ObjectId(),
+            "imageUrl": upload_result["imageUrl"],
+            "pdfUrl": upload_result["pdfUrl"],
+            "uploadedBy": uploaded_by,
+            "uploadedAt": uploaded_at,
+            "summary": summary,
+        }
+        note_docs.append(note_doc)
+        results.append({
+            "index": index,
+            "filename": filename,
+            "ok": True,
+            "note": {"id": str(note_doc["_id"]), **note_doc, "_id": None},
+        })
+
+    await note_service.insert_notes(class_obj_id, note_docs)
+
+    return {
+        "uploaded": len(note_docs),
+        "failed": len(files) - len(note_docs),
+        "results": results,
+    }
@@ -0,0 +1,78 @@
+import json
+
+from fastapi import HTTPException
+
+
+class MaxBodySizeMiddleware:
+    """
+    Rejects request bodies over the limit for their path with a 413, before
+    the multipart parser has spooled them. `limits` maps path prefixes to
+    byte limits; the longest matching prefix wins.
+
+    A too-large Content-Length is refused without reading anything; bodies
+    without one (chunked transfer) are counted as they stream in and cut off
+    with an HTTPException, which FastAPI passes through its body parser.
+    """
+
+    def __init__(self, app, limits: dict[str, int]):
+        self.app = app
+        self.limits = sorted(limits.items(), key=lambda item: len(item[0]), reverse=True)
+
+    def _limit_for(self, path: str) -> int | None:
+        for prefix, max_bytes in self.limits:
+            if path.startswith(prefix):
+                return max_bytes
+        return None
+
+    @staticmethod
+    def _detail(max_bytes: int) -> str:
+        return f"Upload too large (max {max_bytes} bytes)."
+
+    async def _reject(self, send, max_bytes: int) -> None:
+        body = json.dumps({"detail": self._detail(max_bytes)}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope, receive, send):
+        max_bytes = self._limit_for(scope["path"]) if scope["type"] == "http" else None
+        if max_bytes is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+            await self._reject(send, max_bytes)
+            return
+
+        received = 0
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    raise HTTPException(status_code=413, detail=self._detail(max_bytes))
+            return message
+
+        async def tracking_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except HTTPException as e:
+            if e.status_code != 413 or response_started:
+                raise
+            await self._reject(send, max_bytes)
@@ -0,0 +1,113 @@
+import asyncio
+import functools
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable
+
+
+def _timed_call(fn: Callable[[], Any], submitted_at: float) -> tuple[Any, float, float]:
+    # Module level so it can be pickled into process pools as well as threads.
+    started_at = time.monotonic()
+    result = fn()
+    return result, started_at - submitted_at, time.monotonic() - started_at
+
+
+class ExecutorSaturated(RuntimeError):
+    """Raised when a bounded executor has no room left for another job."""
+
+
+class BoundedExecutor:
+    """
+    Runs blocking callables on a worker pool without blocking the event loop.
+
+    At most `max_workers` jobs run at once and at most `max_queue` more may wait
+    for a worker. Anything beyond that is rejected immediately with
+    ExecutorSaturated so the route can answer with backpressure instead of
+    letting requests pile up.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int,
+        max_queue: int,
+        executor_factory: Callable[[int], Executor] | None = None,
+    ):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._executor_factory = executor_factory or (
+            lambda n: ThreadPoolExecutor(max_workers=n, thread_name_prefix=name)
+        )
+        self._executor: Executor | None = None
+
+        # Only touched from the event loop, so no locking is needed.
+        self._pending = 0
+
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._run_total = 0.0
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = self._executor_factory(self.max_workers)
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        if self._pending >= self.capacity:
+            self._rejected += 1
+            raise ExecutorSaturated(f"{self.name} is busy, try again shortly")
+
+        self._pending += 1
+        self._submitted += 1
+        loop = asyncio.get_running_loop()
+        try:
+            result, waited, ran = await loop.run_in_executor(
+                self._get_executor(),
+                _timed_call,
+                functools.partial(fn, *args, **kwargs),
+                time.monotonic(),
+            )
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._pending -= 1
+
+        self._completed += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        self._run_total += ran
+        return result
+
+    def metrics(self) -> dict:
+        finished = self._completed or 1
+        running = min(self._pending, self.max_workers)
+        return {
+            "name": self.name,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._pending,
+            "running": running,
+            "queue_depth": self._pending - running,
+            "submitted": self._submitted,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "avg_wait_ms": round(self._wait_total / finished * 1000, 2),
+            "max_wait_ms": round(self._wait_max * 1000, 2),
+            "avg_run_ms": round(self._run_total / finished * 1000, 2),
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
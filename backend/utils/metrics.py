@@ -0,0 +1,132 @@
+import time
+from contextlib import contextmanager
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from pymongo import monitoring
+
+# Prometheus metrics for this process, served at GET /metrics.
+# Labels stay low-cardinality: route templates (not raw paths), Mongo command
+# names and a fixed set of upstream operations.
+
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time to serve a request, by route template.",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests being served right now.",
+    ["method"],
+)
+MONGO_LATENCY = Histogram(
+    "mongo_command_duration_seconds",
+    "Time for a MongoDB command, as reported by the driver.",
+    ["command", "outcome"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+UPSTREAM_LATENCY = Histogram(
+    "upstream_call_duration_seconds",
+    "Time for a call to an external service (Cloudinary, Gemini).",
+    ["service", "operation", "outcome"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+UPSTREAM_ERRORS = Counter(
+    "upstream_call_errors_total",
+    "Failed calls to an external service, by exception type.",
+    ["service", "operation", "error"],
+)
+
+
+class MetricsMiddleware:
+    """
+    Records latency per route template and in-flight requests per method.
+    The route is only known once routing has run, so it is read from the
+    scope after the app returns.
+    """
+
+    def __init__(self, app, skip_paths: tuple[str, ...] = ("/metrics",)):
+        self.app = app
+        self.skip_paths = skip_paths
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+
+        async def tracking_send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight = HTTP_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, tracking_send)
+        finally:
+            in_flight.dec()
+            route = scope.get("route")
+            HTTP_LATENCY.labels(
+                method,
+                getattr(route, "path", "unmatched"),
+                str(status),
+            ).observe(time.perf_counter() - started)
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        MONGO_LATENCY.labels(event.command_name, "ok").observe(event.duration_micros / 1e6)
+
+    def failed(self, event):
+        MONGO_LATENCY.labels(event.command_name, "error").observe(event.duration_micros / 1e6)
+
+
+class _PoolCollector:
+    """Reads the connection pool counters kept by backend.database on scrape."""
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+
+    def collect(self):
+        stats = self.snapshot()
+        yield GaugeMetricFamily("mongo_pool_connections_in_use", "Connections checked out.", value=stats["in_use"])
+        yield GaugeMetricFamily("mongo_pool_connections_open", "Connections open.", value=stats["open"])
+        yield CounterMetricFamily("mongo_pool_checkouts", "Connection checkouts.", value=stats["checkouts"])
+        yield CounterMetricFamily(
+            "mongo_pool_checkout_failures", "Checkouts that failed or timed out.", value=stats["checkout_failures"]
+        )
+        yield GaugeMetricFamily(
+            "mongo_pool_checkout_wait_max_seconds",
+            "Longest wait for a connection so far.",
+            value=stats["checkout_wait_max_ms"] / 1000,
+        )
+
+
+def register_pool_collector(snapshot) -> None:
+    REGISTRY.register(_PoolCollector(snapshot))
+
+
+@contextmanager
+def time_upstream(service: str, operation: str):
+    """Times the block as one call to `service`; exceptions are counted and re-raised."""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        UPSTREAM_LATENCY.labels(service, operation, "error").observe(time.perf_counter() - started)
+        UPSTREAM_ERRORS.labels(service, operation, type(e).__name__).inc()
+        raise
+    UPSTREAM_LATENCY.labels(service, operation, "ok").observe(time.perf_counter() - started)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    return generate_latest(), CONTENT_TYPE_LATEST
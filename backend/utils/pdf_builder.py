@@ -0,0 +1,82 @@
+import io
+
+# Writes image-only PDFs by hand so JPEG data can be embedded as-is
+# (/DCTDecode) instead of being decoded and compressed again.
+
+_EXIF_ORIENTATION = 0x0112
+_COLOR_SPACES = {"L": b"/DeviceGray", "RGB": b"/DeviceRGB"}
+
+
+def _page_jpeg(data: bytes) -> tuple[bytes, int, int, bytes]:
+    """JPEG bytes for one page with its width, height and PDF colour space."""
+    from PIL import Image, ImageOps
+
+    image = Image.open(io.BytesIO(data))
+    orientation = image.getexif().get(_EXIF_ORIENTATION, 1)
+    if image.format == "JPEG" and image.mode in _COLOR_SPACES and orientation == 1:
+        return data, image.width, image.height, _COLOR_SPACES[image.mode]
+
+    # Anything else (PNG, CMYK, rotated via EXIF) has to be re-encoded once.
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in _COLOR_SPACES:
+        image = image.convert("RGB")
+    out = io.BytesIO()
+    image.save(out, format="JPEG", quality=90)
+    return out.getvalue(), image.width, image.height, _COLOR_SPACES[image.mode]
+
+
+def build_pdf(images: list[bytes], dpi: int = 150) -> bytes:
+    """One page per image, in order, each page sized to its image at `dpi`."""
+    if not images:
+        raise ValueError("At least one image is needed to build a PDF.")
+
+    # Object 1 is the catalog and 2 the page tree; the rest are appended.
+    objects: list[bytes] = [b"", b""]
+    page_refs = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    for data in images:
+        jpeg, width, height, color_space = _page_jpeg(data)
+        image_ref = add(
+            b"<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace %s "
+            b"/BitsPerComponent 8 /Filter /DCTDecode /Length %d >>\nstream\n"
+            % (width, height, color_space, len(jpeg))
+            + jpeg + b"\nendstream"
+        )
+
+        page_width = width * 72 / dpi
+        page_height = height * 72 / dpi
+        content = b"q %.2f 0 0 %.2f 0 0 cm /Im0 Do Q" % (page_width, page_height)
+        content_ref = add(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+
+        page_refs.append(add(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %.2f %.2f] "
+            b"/Resources << /XObject << /Im0 %d 0 R >> >> /Contents %d 0 R >>"
+            % (page_width, page_height, image_ref, content_ref)
+        ))
+
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % ref for ref in page_refs),
+        len(page_refs),
+    )
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+
+    xref_at = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(
+        b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+        % (len(objects) + 1, xref_at)
+    )
+    return out.getvalue()
@@ -1,11 +1,212 @@
-from pypdf import PdfReader
+import asyncio
+import hashlib
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from io import BytesIO
+from typing import Iterator
+
+from backend.utils.bounded_executor import BoundedExecutor
+
+# Text extraction is pure-Python CPU work, so the parallel mode hands batches
+# of PDF_BATCH_PAGES pages to a process pool. Each worker parses the PDF
+# itself; only the bytes and the page range cross the process boundary.
+PDF_MAX_WORKERS = int(os.getenv("PDF_MAX_WORKERS", str(os.cpu_count() or 1)))
+PDF_MAX_QUEUE = int(os.getenv("PDF_MAX_QUEUE", str(PDF_MAX_WORKERS * 4)))
+PDF_BATCH_PAGES = max(1, int(os.getenv("PDF_BATCH_PAGES", "25")))
+# Extracted text is kept per page, keyed by a hash of the PDF bytes.
+PDF_TEXT_CACHE_MAX_BYTES = int(os.getenv("PDF_TEXT_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+pdf_executor = BoundedExecutor(
+    name="pdf-text",
+    max_workers=PDF_MAX_WORKERS,
+    max_queue=PDF_MAX_QUEUE,
+    executor_factory=lambda n: ProcessPoolExecutor(max_workers=n),
+)
+
+
+# Rough memory per cached document and per cached page besides the text, so
+# image-only PDFs (whose pages have no text) still count against the limit.
+_DOC_OVERHEAD_BYTES = 512
+_PAGE_OVERHEAD_BYTES = 64
+
+
+class _CachedPdf:
+    def __init__(self):
+        self.pages: dict[int, str] = {}
+        self.page_count: int | None = None
+        self.size = _DOC_OVERHEAD_BYTES
+
+
+class PageTextCache:
+    """
+    LRU of {page index: text} per PDF, bounded by an estimate of the bytes
+    kept: the text's length plus a fixed overhead per document and per page.
+    Page counts live in the same entry, so a full hit never parses the PDF.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._docs: OrderedDict[str, _CachedPdf] = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _entry(self, digest: str) -> _CachedPdf:
+        entry = self._docs.get(digest)
+        if entry is None:
+            entry = self._docs[digest] = _CachedPdf()
+            self._size += entry.size
+        self._docs.move_to_end(digest)
+        return entry
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes and self._docs:
+            _, evicted = self._docs.popitem(last=False)
+            self._size -= evicted.size
+
+    def get(self, digest: str, pages: range) -> tuple[dict[int, str], list[int]]:
+        """Cached text for `pages`, and the page indices that are missing."""
+        entry = self._docs.get(digest)
+        doc = entry.pages if entry else {}
+        if doc:
+            self._docs.move_to_end(digest)
+        found = {i: doc[i] for i in pages if i in doc}
+        missing = [i for i in pages if i not in doc]
+        self.hits += len(found)
+        self.misses += len(missing)
+        return found, missing
+
+    def put(self, digest: str, texts: dict[int, str]) -> None:
+        entry = self._entry(digest)
+        for i, text in texts.items():
+            if i not in entry.pages:
+                entry.pages[i] = text
+                added = len(text) + _PAGE_OVERHEAD_BYTES
+                entry.size += added
+                self._size += added
+        self._evict()
+
+    def _cached_page_count(self, digest: str) -> int | None:
+        entry = self._docs.get(digest)
+        if entry is None or entry.page_count is None:
+            return None
+        self._docs.move_to_end(digest)
+        return entry.page_count
+
+    def _remember_page_count(self, digest: str, count: int) -> int:
+        self._entry(digest).page_count = count
+        self._evict()
+        return count
+
+    def page_count(self, digest: str, file_bytes: bytes) -> int:
+        count = self._cached_page_count(digest)
+        if count is None:
+            count = self._remember_page_count(digest, page_count(file_bytes))
+        return count
+
+    async def page_count_parallel(self, digest: str, file_bytes: bytes) -> int:
+        # A miss parses the PDF on the process pool, like the page batches.
+        count = self._cached_page_count(digest)
+        if count is None:
+            count = self._remember_page_count(digest, await pdf_executor.run(page_count, file_bytes))
+        return count
+
+    def stats(self) -> dict:
+        return {
+            "documents": len(self._docs),
+            "bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+page_text_cache = PageTextCache(PDF_TEXT_CACHE_MAX_BYTES)
+
+
+def pdf_digest(file_bytes: bytes) -> str:
+    return hashlib.sha256(file_bytes).hexdigest()
 
-def extract_text_from_pdf(file_bytes: bytes) -> str:
-    reader = PdfReader(BytesIO(file_bytes))
-    text = ""
 
-    for page in reader.pages:
-        text += page.extract_text() or ""
+def _reader(file_bytes: bytes):
+    # pypdf is imported on first use to keep API startup fast.
+    from pypdf import PdfReader
 
-    return text
+    return PdfReader(BytesIO(file_bytes))
+
+
+def page_count(file_bytes: bytes) -> int:
+    return len(_reader(file_bytes).pages)
+
+
+def _page_range(total: int, start: int, stop: int | None) -> range:
+    # Same rules as slicing a list of pages.
+    return range(*slice(start, stop).indices(total))
+
+
+def iter_page_text(file_bytes: bytes, start: int = 0, stop: int | None = None) -> Iterator[str]:
+    """Yields the text of each page in [start, stop), one page at a time."""
+    reader = _reader(file_bytes)
+    for i in _page_range(len(reader.pages), start, stop):
+        yield reader.pages[i].extract_text() or ""
+
+
+def _extract_batch(file_bytes: bytes, start: int, stop: int) -> list[str]:
+    # Module level so the process pool can pickle it.
+    return list(iter_page_text(file_bytes, start, stop))
+
+
+def _batches(indices: list[int]) -> list[tuple[int, int]]:
+    # Contiguous runs of missing pages, split into PDF_BATCH_PAGES-sized pieces.
+    batches = []
+    for i in indices:
+        if batches and batches[-1][1] == i and batches[-1][1] - batches[-1][0] < PDF_BATCH_PAGES:
+            batches[-1][1] = i + 1
+        else:
+            batches.append([i, i + 1])
+    return [(first, last) for first, last in batches]
+
+
+def extract_pages(file_bytes: bytes, start: int = 0, stop: int | None = None) -> list[str]:
+    """Text of pages [start, stop) in the calling thread, using the cache."""
+    digest = pdf_digest(file_bytes)
+    pages = _page_range(page_text_cache.page_count(digest, file_bytes), start, stop)
+    found, missing = page_text_cache.get(digest, pages)
+
+    extracted = {}
+    for first, last in _batches(missing):
+        extracted.update(zip(range(first, last), _extract_batch(file_bytes, first, last)))
+    page_text_cache.put(digest, extracted)
+
+    return [found.get(i, extracted.get(i)) for i in pages]
+
+
+async def extract_pages_parallel(file_bytes: bytes, start: int = 0, stop: int | None = None) -> list[str]:
+    """
+    Like extract_pages, but uncached pages are extracted in batches on the
+    process pool. Raises ExecutorSaturated when the pool and its queue are full.
+    """
+    # Hashing a large PDF takes a while too; hashlib releases the GIL for it.
+    digest = await asyncio.to_thread(pdf_digest, file_bytes)
+    pages = _page_range(await page_text_cache.page_count_parallel(digest, file_bytes), start, stop)
+    found, missing = page_text_cache.get(digest, pages)
+
+    # Keep one document from taking more than the pool's worth of slots.
+    slots = asyncio.Semaphore(pdf_executor.max_workers)
+
+    async def run(first: int, last: int) -> dict[int, str]:
+        async with slots:
+            texts = await pdf_executor.run(_extract_batch, file_bytes, first, last)
+        return dict(zip(range(first, last), texts))
+
+    extracted = {}
+    for texts in await asyncio.gather(*(run(first, last) for first, last in _batches(missing))):
+        extracted.update(texts)
+    page_text_cache.put(digest, extracted)
+
+    return [found.get(i, extracted.get(i)) for i in pages]
+
+
+def extract_text_from_pdf(file_bytes: bytes) -> str:
+    return "".join(extract_pages(file_bytes))
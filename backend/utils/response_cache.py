@@ -0,0 +1,141 @@
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Iterable
+
+from fastapi import Request, Response
+
+from backend.utils.fast_json import dumps, json_response
+
+# Read responses kept in this process. Writes made through this process
+# invalidate them right away; writes made by other API processes show up once
+# the entry expires, so keep the TTL short.
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "30"))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(4 * 1024 * 1024)))
+
+
+def class_tag(class_id) -> str:
+    return f"class:{class_id}"
+
+
+def user_tag(user_id) -> str:
+    return f"user:{user_id}"
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+class ResponseCache:
+    """
+    LRU of read responses with a TTL, kept as encoded JSON so a hit is sent
+    as-is, with no validation or serialization.
+
+    Each entry carries tags (see class_tag and user_tag); writes call
+    invalidate() with the tags they affect. A response loaded while an
+    invalidation happened is served but not stored, so a slow read can't put
+    back data that a concurrent write just replaced.
+    """
+
+    def __init__(self, ttl: float, max_bytes: int):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Any, tuple[float, str, bytes, frozenset]] = OrderedDict()
+        self._keys_by_tag: dict[str, set] = {}
+        self._size = 0
+        self._generation = 0
+        self._stats = {"hits": 0, "misses": 0, "not_modified": 0, "invalidations": 0}
+
+    def _drop(self, key) -> None:
+        _, _, body, tags = self._entries.pop(key)
+        self._size -= len(body)
+        for tag in tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+    def _get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _put(self, key, etag: str, body: bytes, tags: frozenset) -> None:
+        if key in self._entries:
+            self._drop(key)
+        if len(body) > self.max_bytes:
+            return
+
+        self._entries[key] = (time.monotonic() + self.ttl, etag, body, tags)
+        self._size += len(body)
+        for tag in tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+        while self._size > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+
+    def invalidate(self, *tags: str) -> None:
+        self._generation += 1
+        self._stats["invalidations"] += 1
+        for tag in tags:
+            for key in list(self._keys_by_tag.get(tag, ())):
+                self._drop(key)
+
+    async def respond(
+        self,
+        request: Request,
+        key,
+        load: Callable[[], Awaitable[Any]],
+        tags: Callable[[Any], Iterable[str]],
+    ) -> Response:
+        """
+        Returns the cached response for `key`, or calls `load()` and caches
+        its JSON under `tags(data)`. `load` must return data already in the
+        API's shape: it is encoded as-is, not checked against a response_model.
+        Returns an empty 304 instead when the client already has this version.
+        HTTPExceptions raised by `load` pass through and are not cached.
+        """
+        entry = self._get(key)
+        if entry is not None:
+            self._stats["hits"] += 1
+            _, etag, body, _ = entry
+        else:
+            self._stats["misses"] += 1
+            generation = self._generation
+            data = await load()
+            body = dumps(data)
+            etag = _etag(body)
+            if generation == self._generation:
+                self._put(key, etag, body, frozenset(tags(data)))
+
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if _matches(request.headers.get("if-none-match"), etag):
+            self._stats["not_modified"] += 1
+            return Response(status_code=304, headers=headers)
+
+        return json_response(body=body, headers=headers)
+
+    def stats(self) -> dict:
+        return {
+            **self._stats,
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl,
+        }
+
+
+response_cache = ResponseCache(RESPONSE_CACHE_TTL_SECONDS, RESPONSE_CACHE_MAX_BYTES)
@@ -12,13 +12,14 @@ import {
 
 import { Text, View } from "@/components/Themed";
 import { getCurrentUser } from "@/lib/current_user";
+import { authFetch } from "@/lib/api/auth_api";
 import { CameraView, useCameraPermissions } from "expo-camera";
 
 interface Course {
   id: string;
   name: string;
-  users?: string[];
-  photos?: any[];
+  memberCount?: number;
+  noteCount?: number;
   code?: string;
   emoji?: string;
 }
@@ -31,7 +32,8 @@ interface Course {
 const API_BASE_URL =
   process.env.EXPO_PUBLIC_API_BASE_URL ?? "http://10.136.226.189:8000";
 const UPLOAD_ENDPOINT = `${API_BASE_URL}/api/upload-to-pdf-and-save`;
-const CLASSES_ENDPOINT = `${API_BASE_URL}/api/classes`;
+// The signed-in user's classes, most recently active first, in one request.
+const FEED_ENDPOINT = `${API_BASE_URL}/api/feed`;
 
 type UploadResult = { imageUrl: string; pdfUrl: string };
 
@@ -72,12 +74,11 @@ export default function TabTwoScreen() {
 
       setCoursesLoading(true);
       try {
-        const url = `${CLASSES_ENDPOINT}?user_id=${encodeURIComponent(userId)}`;
-        const res = await fetch(url);
+        const res = await authFetch(FEED_ENDPOINT);
         const text = await res.text();
         if (!res.ok) throw new Error(`Load courses failed (${res.status}): ${text}`);
-        const data = JSON.parse(text) as Course[];
-        if (!cancelled) setCourses(Array.isArray(data) ? data : []);
+        const data = JSON.parse(text) as { classes: Course[] };
+        if (!cancelled) setCourses(Array.isArray(data.classes) ? data.classes : []);
       } catch (e) {
         if (!cancelled) setErrorMsg(String(e));
       } finally {
@@ -89,7 +90,7 @@ export default function TabTwoScreen() {
     return () => {
       cancelled = true;
     };
-  }, [CLASSES_ENDPOINT]);
+  }, [FEED_ENDPOINT]);
 
   const handleCapture = async () => {
     setErrorMsg(null);
@@ -186,7 +187,7 @@ const uploadCapturedToPdf = async () => {
 
     const metadata = {
       class_id: selectedCourse.id,
-      uploaded_by: getCurrentUser().userId,
+      uploaded_by: getCurrentUser().email,
       summary:
         summaryText.trim() || `Scan from ${selectedCourse.name}`,
     };
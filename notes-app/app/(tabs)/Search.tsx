@@ -13,12 +13,14 @@ import {
 import { Text, View } from "@/components/Themed";
 import { router } from "expo-router";
 import { getCurrentUser } from "@/lib/current_user";
+import { authFetch } from "@/lib/api/auth_api";
 
 type ClassOut = {
   id: string;
   name: string;
-  users?: any[];
-  photos?: any[];
+  memberCount: number;
+  noteCount: number;
+  isMember?: boolean;
 };
 
 const API_BASE_URL = "http://10.136.226.189:8000";
@@ -44,11 +46,6 @@ function emojiForCourseName(name: string) {
   return "📘";
 }
 
-function isUserInClass(users: unknown, userId: string) {
-  if (!Array.isArray(users)) return false;
-  return users.some((u) => String(u) === userId);
-}
-
 export default function SearchScreen() {
   const [searchQuery, setSearchQuery] = useState("");
   const q = useMemo(() => searchQuery.trim(), [searchQuery]);
@@ -63,7 +60,9 @@ export default function SearchScreen() {
   const [joinLoading, setJoinLoading] = useState(false);
 
   const fetchSearchResults = async (query: string) => {
-    const url = `${SEARCH_ENDPOINT}?name=${encodeURIComponent(query)}`;
+    const url = `${SEARCH_ENDPOINT}?name=${encodeURIComponent(
+      query
+    )}&user_id=${encodeURIComponent(getCurrentUserId())}`;
     const res = await fetch(url);
     const text = await res.text();
     if (!res.ok) throw new Error(`Search failed (${res.status}): ${text}`);
@@ -72,11 +71,8 @@ export default function SearchScreen() {
   };
 
   const joinClass = async (classId: string) => {
-    const userId = getCurrentUserId();
-    const url = `${API_BASE_URL}/api/classes/${classId}/join?user_id=${encodeURIComponent(
-      userId
-    )}`;
-    const res = await fetch(url, { method: "POST" });
+    const url = `${API_BASE_URL}/api/classes/${classId}/join`;
+    const res = await authFetch(url, { method: "POST" });
     const text = await res.text();
     if (!res.ok) throw new Error(`Join failed (${res.status}): ${text}`);
   };
@@ -116,9 +112,7 @@ export default function SearchScreen() {
   }, [q]);
 
   const onTapClass = (item: ClassOut) => {
-    const isMember = isUserInClass(item.users, getCurrentUserId());
-
-    if (isMember) {
+    if (item.isMember) {
       router.push(`/class/${item.id}`);
       return;
     }
@@ -140,10 +134,8 @@ export default function SearchScreen() {
           c.id === selectedClass.id
             ? {
                 ...c,
-                users: [
-                  ...(Array.isArray(c.users) ? c.users : []),
-                  getCurrentUserId(),
-                ],
+                isMember: true,
+                memberCount: c.isMember ? c.memberCount : c.memberCount + 1,
               }
             : c
         )
@@ -218,7 +210,7 @@ export default function SearchScreen() {
               columnWrapperStyle={{ gap: 12 }}
               contentContainerStyle={{ gap: 12 }}
               renderItem={({ item }) => {
-                const isMember = isUserInClass(item.users, getCurrentUserId());
+                const isMember = !!item.isMember;
 
                 return (
                   <TouchableOpacity
@@ -238,7 +230,7 @@ export default function SearchScreen() {
                         {isMember ? "Enrolled ✅ (tap to open)" : "Tap to join"}
                       </Text>
                       <Text style={styles.cardTerm}>
-                        {Array.isArray(item.users) ? item.users.length : 0} members
+                        {item.memberCount ?? 0} members
                       </Text>
                     </View>
                   </TouchableOpacity>
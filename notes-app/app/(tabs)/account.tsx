@@ -10,6 +10,7 @@ import {
 import { LinearGradient } from "expo-linear-gradient";
 import { Ionicons } from "@expo/vector-icons";
 import { getCurrentUser, setCurrentUser } from "@/lib/current_user";
+import { authFetch } from "@/lib/api/auth_api";
 
 export default function AccountScreen() {
   const initialUser = getCurrentUser();
@@ -33,8 +34,8 @@ export default function AccountScreen() {
     const nextPhone = editing === "phone" ? tempValue : phone;
 
     try {
-      const res = await fetch(
-        `${API_BASE_URL}/api/auth/profile?email=${encodeURIComponent(email)}`,
+      const res = await authFetch(
+        `${API_BASE_URL}/api/auth/profile`,
         {
           method: "PUT",
           headers: { "Content-Type": "application/json" },
@@ -52,6 +53,11 @@ export default function AccountScreen() {
         email: data.email ?? nextEmail,
         name: data.name ?? name,
         phone: data.phone ?? nextPhone,
+        // A changed email comes back with tokens for the new one.
+        ...(data.access_token && {
+          accessToken: data.access_token,
+          refreshToken: data.refresh_token,
+        }),
       };
       setEmail(nextUser.email);
       setPhone(nextUser.phone ?? "");
@@ -72,11 +78,7 @@ export default function AccountScreen() {
           return;
         }
 
-        const res = await fetch(
-          `${API_BASE_URL}/api/auth/profile?email=${encodeURIComponent(
-            CURRENT_USER_EMAIL
-          )}`
-        );
+        const res = await authFetch(`${API_BASE_URL}/api/auth/profile`);
         const text = await res.text();
         if (!res.ok) throw new Error(text || "Failed to load profile");
         const data = JSON.parse(text);
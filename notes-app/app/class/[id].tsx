@@ -21,24 +21,42 @@ type Note = {
   summary?: string | null;
 };
 
+type NotePage = {
+  notes: Note[];
+  nextCursor?: string | null;
+};
+
+const PAGE_SIZE = 20;
+
 export default function ClassScreen() {
   const params = useLocalSearchParams<{ id: string }>();
   const classId = String(params.id ?? "");
 
   const [notes, setNotes] = useState<Note[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [errorMsg, setErrorMsg] = useState<string | null>(null);
 
+  // Notes come back newest first, one page at a time.
+  const fetchPage = async (after: string | null) => {
+    let url = `${NOTES_ENDPOINT}?class_id=${encodeURIComponent(
+      classId
+    )}&limit=${PAGE_SIZE}`;
+    if (after) url += `&after=${encodeURIComponent(after)}`;
+    const res = await fetch(url);
+    const text = await res.text();
+    if (!res.ok) throw new Error(text);
+    return JSON.parse(text) as NotePage;
+  };
+
   const loadNotes = async () => {
     setLoading(true);
     setErrorMsg(null);
     try {
-      const url = `${NOTES_ENDPOINT}?class_id=${encodeURIComponent(classId)}`;
-      const res = await fetch(url);
-      const text = await res.text();
-      if (!res.ok) throw new Error(text);
-      const data = JSON.parse(text) as Note[];
-      setNotes(Array.isArray(data) ? data.slice().reverse() : []);
+      const page = await fetchPage(null);
+      setNotes(Array.isArray(page.notes) ? page.notes : []);
+      setNextCursor(page.nextCursor ?? null);
     } catch (e) {
       setErrorMsg(String(e));
     } finally {
@@ -46,6 +64,20 @@ export default function ClassScreen() {
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage(nextCursor);
+      setNotes((prev) => [...prev, ...(page.notes ?? [])]);
+      setNextCursor(page.nextCursor ?? null);
+    } catch (e) {
+      setErrorMsg(String(e));
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     if (classId) loadNotes();
   }, [classId]);
@@ -110,6 +142,9 @@ export default function ClassScreen() {
             data={notes}
             keyExtractor={(n) => n.id}
             contentContainerStyle={{ gap: 12, paddingBottom: 120 }}
+            onEndReached={loadMore}
+            onEndReachedThreshold={0.5}
+            ListFooterComponent={loadingMore ? <ActivityIndicator /> : null}
             renderItem={({ item }) => (
               <TouchableOpacity
                 style={styles.card}
@@ -37,6 +37,8 @@ export default function LoginScreen() {
         name: data?.name ?? "",
         userId: data?.userId ?? email.trim(),
         phone: data?.phone ?? "",
+        accessToken: data?.access_token,
+        refreshToken: data?.refresh_token,
       });
 
       // Navigate to your actual tab screen (adjust if needed)
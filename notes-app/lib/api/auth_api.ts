@@ -2,8 +2,11 @@ const API_BASE_URL =
   process.env.EXPO_PUBLIC_API_BASE_URL ?? "http://10.136.226.189:8000";
 // ^ if your AUTH backend is on a different port, change it (ex: :8001)
 
+import { getCurrentUser, setCurrentUser } from "@/lib/current_user";
+
 const LOGIN_ENDPOINT = `${API_BASE_URL}/api/auth/login`; 
 const SIGNUP_ENDPOINT = `${API_BASE_URL}/api/auth/signup`;
+const REFRESH_ENDPOINT = `${API_BASE_URL}/api/auth/refresh`;
 // If your docs show the route is /api/login instead, change to `${API_BASE_URL}/api/login`
 
 export async function login(email: string, password: string) {
@@ -26,6 +29,41 @@ export async function login(email: string, password: string) {
   return await res.json();
 }
 
+async function refreshTokens() {
+  const { refreshToken } = getCurrentUser();
+  if (!refreshToken) return false;
+
+  const res = await fetch(REFRESH_ENDPOINT, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ refresh_token: refreshToken }),
+  });
+  if (!res.ok) return false;
+
+  const data = await res.json();
+  setCurrentUser({ accessToken: data.access_token, refreshToken: data.refresh_token });
+  return true;
+}
+
+// fetch() for routes that need the signed-in user: sends the access token,
+// and if it has expired, refreshes it once and retries.
+export async function authFetch(url: string, init: RequestInit = {}) {
+  const send = () =>
+    fetch(url, {
+      ...init,
+      headers: {
+        ...(init.headers as Record<string, string>),
+        Authorization: `Bearer ${getCurrentUser().accessToken ?? ""}`,
+      },
+    });
+
+  const res = await send();
+  if (res.status === 401 && (await refreshTokens())) {
+    return send();
+  }
+  return res;
+}
+
 export async function signup(
   email: string,
   password: string,
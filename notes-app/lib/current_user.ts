@@ -3,6 +3,9 @@ export type CurrentUser = {
   name: string;
   userId: string;
   phone?: string;
+  // Signed session tokens from /api/auth/login (see authFetch).
+  accessToken?: string;
+  refreshToken?: string;
 };
 
 let currentUser: CurrentUser = {